@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Form, status, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Form, Query, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import EmailStr
 from domain.entity.user import UserEmail, UserSignUp, UserVerify, UserSignIn, ConfirmForgotPassword, ChangePassword, RefreshToken, AccessToken
 from usecase.service.auth_service import AuthService
-from core.aws_cognito import AWS_Cognito
-from core.dependencies import get_aws_cognito
+from core.aws_cognito import AWS_Cognito, run_cognito
+from core.dependencies import get_aws_cognito, require_admin
+from schema.response.ndjson_response import NDJSONResponse
 
 
 
@@ -23,7 +26,7 @@ async def signup_user(
     user: UserSignUp,
     cognito: AWS_Cognito = Depends(get_aws_cognito)
 ):
-    return AuthService.user_signup(user, cognito)
+    return await run_cognito(AuthService.user_signup, user, cognito)
 
 
 # メールアドレス認証
@@ -32,7 +35,7 @@ async def verify_account(
     data: UserVerify,
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.verify_account(data, cognito)
+    return await run_cognito(AuthService.verify_account, data, cognito)
 
 
 # 認証コード再送信申請
@@ -41,7 +44,7 @@ async def resend_confirmation_code(
     data: UserEmail = Form(...),
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.resend_confirmation_code(data.email, cognito)
+    return await run_cognito(AuthService.resend_confirmation_code, data.email, cognito)
 
 
 # ログイン
@@ -50,7 +53,7 @@ async def signin(
     data: UserSignIn,
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.user_signin(data, cognito)
+    return await run_cognito(AuthService.user_signin, data, cognito)
 
 
 # パスワード忘れ：再発行申請
@@ -59,7 +62,7 @@ async def forgot_password(
     data: UserEmail,
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.forgot_password(data.email, cognito)
+    return await run_cognito(AuthService.forgot_password, data.email, cognito)
 
 
 # パスワード忘れ：パスワード変更
@@ -68,7 +71,7 @@ async def confirm_forgot_password(
     data: ConfirmForgotPassword,
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.confirm_forgot_password(data, cognito)
+    return await run_cognito(AuthService.confirm_forgot_password, data, cognito)
 
 
 # パスワード変更
@@ -77,7 +80,7 @@ async def change_password(
     data: ChangePassword,
     cognito: AWS_Cognito = Depends(get_aws_cognito),
 ):
-    return AuthService.change_password(data, cognito)
+    return await run_cognito(AuthService.change_password, data, cognito)
 
 
 # アクセストークン再発行
@@ -86,7 +89,7 @@ async def new_access_token(
     refresh_token: RefreshToken,
     cognito: AWS_Cognito = Depends(get_aws_cognito)
 ):
-    return AuthService.new_access_token(refresh_token.refresh_token, cognito)
+    return await run_cognito(AuthService.new_access_token, refresh_token.refresh_token, cognito)
 
 
 # ログアウト
@@ -96,7 +99,7 @@ async def logout(
     cognito: AWS_Cognito = Depends(get_aws_cognito),
     token: str = Depends(oauth2_scheme),
 ):
-    return AuthService.logout(access_token.access_token, cognito)
+    return await run_cognito(AuthService.logout, access_token.access_token, cognito)
 
 
 # ユーザ情報取得
@@ -105,12 +108,46 @@ async def user_details(
     email: EmailStr = Form(),
     cognito: AWS_Cognito = Depends(get_aws_cognito)
 ):
-    return AuthService.user_details(email, cognito)
+    return await run_cognito(AuthService.user_details, email, cognito)
+
+
+UserStatus = Literal[
+    "UNCONFIRMED", "CONFIRMED", "ARCHIVED", "COMPROMISED", "UNKNOWN", "RESET_REQUIRED", "FORCE_CHANGE_PASSWORD", "EXTERNAL_PROVIDER"
+]
 
 
+# ユーザ属性キャッシュの統計
+@auth_router.get("/user_cache_stats", status_code=status.HTTP_200_OK, tags=["Auth"])
+async def user_cache_stats(
+    claims: dict = Depends(require_admin),
+    cognito: AWS_Cognito = Depends(get_aws_cognito)
+):
+    return AuthService.user_cache_stats(cognito)
+
+
+# ユーザ一覧取得
 @auth_router.get("/list", status_code=status.HTTP_200_OK, tags=["Auth"])
 async def list_user(
+    limit: int | None = Query(default=None, ge=1, le=60),
+    cursor: str | None = None,
+    email_prefix: str | None = Query(default=None, min_length=1),
+    user_status: UserStatus | None = Query(default=None, alias="status"),
+    attributes: str | None = Query(default=None, description="返す属性名のカンマ区切り"),
+    claims: dict = Depends(require_admin),
+    cognito: AWS_Cognito = Depends(get_aws_cognito)
+):
+    return await run_cognito(AuthService.list_user, cognito, limit, cursor, email_prefix, user_status, attributes)
+
+
+# ユーザ一覧取得（全ページを NDJSON で逐次返す）
+@auth_router.get("/list/stream", status_code=status.HTTP_200_OK, tags=["Auth"], response_class=NDJSONResponse)
+async def list_user_stream(
+    email_prefix: str | None = Query(default=None, min_length=1),
+    user_status: UserStatus | None = Query(default=None, alias="status"),
+    attributes: str | None = Query(default=None, description="返す属性名のカンマ区切り"),
+    claims: dict = Depends(require_admin),
     cognito: AWS_Cognito = Depends(get_aws_cognito)
 ):
-    return AuthService.list_user(cognito)
+    users = await AuthService.stream_users(cognito, email_prefix, user_status, attributes)
+    return NDJSONResponse(users)
 
@@ -1,72 +1,249 @@
-from fastapi import APIRouter, Form, status, Depends
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import APIRouter, Form, Query, Request, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from injector import Injector
 
-from core.dependencies import RepositoryModule
+from core.config import env_vars
+from core.dependencies import injector, verify_token
 from domain.entity.question import Question
-from domain.entity.movie import MovieForm
-from usecase import Usecase
+from domain.entity.movie import MovieForm, MovieKeyList, MovieTransaction
+from schema.response.ndjson_response import NDJSONResponse
+from usecase import AsyncUsecase, Usecase
 from usecase.movie.add_movie import AddMovieUsecase
+from usecase.movie.async_add_movie import AsyncAddMovieUsecase
+from usecase.movie.autocomplete_movie_titles import AutocompleteMovieTitlesUsecase
+from usecase.movie.async_get_movie_detail import AsyncGetMovieDetailUsecase
+from usecase.movie.async_get_movie_list import AsyncGetMovieListUsecase
+from usecase.movie.async_query_movie_list import AsyncQueryMovieListUsecase
+from usecase.movie.count_movies import CountMoviesUsecase
+from usecase.movie.delete_movies import DeleteMoviesUsecase
 from usecase.movie.get_movie_detail import GetMovieDetailUsecase
+from usecase.movie.get_movie_details import GetMovieDetailsUsecase
+from usecase.movie.import_movies import ImportMoviesUsecase
 from usecase.movie.query_movie_list import QueryMovieListUsecase
+from usecase.movie.query_movie_range import QueryMovieRangeUsecase
+from usecase.movie.search_movies import SearchMoviesUsecase
+from usecase.movie.get_movie_aggregates import GetMovieAggregatesUsecase
 from usecase.movie.get_movie_list import GetMovieListUsecase
+from usecase.movie.get_movie_cache_stats import GetMovieCacheStatsUsecase
+from usecase.movie.get_top_movies import GetTopMoviesUsecase
+from usecase.movie.stream_movie_list import StreamMovieListUsecase
+from usecase.movie.transact_movies import TransactMoviesUsecase
 
 movie_router = APIRouter(prefix="/api/v1/movies")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def get_injector() -> Injector:
-    return Injector([
-        RepositoryModule()
-    ])
+    # リソースやユースケースを使い回すため、プロセス内で共有するインジェクタを返す
+    return injector
+
+async def execute(usecase: Usecase | AsyncUsecase, *args):
+    # 同期ユースケースはスレッドプールで実行し、イベントループをブロックしない
+    if isinstance(usecase, AsyncUsecase):
+        return await usecase.execute(*args)
+    return await run_in_threadpool(usecase.execute, *args)
 
 def query_movies_interactor(injector: Injector = Depends(get_injector)):
+    if env_vars.DYNAMODB_ASYNC_ENABLED:
+        return injector.get(AsyncQueryMovieListUsecase)
     return injector.get(QueryMovieListUsecase)
 
 def add_movie_interactor(injector: Injector = Depends(get_injector)):
+    if env_vars.DYNAMODB_ASYNC_ENABLED:
+        return injector.get(AsyncAddMovieUsecase)
     return injector.get(AddMovieUsecase)
 
+def import_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(ImportMoviesUsecase)
+
+def delete_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(DeleteMoviesUsecase)
+
+def transact_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(TransactMoviesUsecase)
+
 def get_movie_list_interactor(injector: Injector = Depends(get_injector)):
+    if env_vars.DYNAMODB_ASYNC_ENABLED:
+        return injector.get(AsyncGetMovieListUsecase)
     return injector.get(GetMovieListUsecase)
 
+def stream_movie_list_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(StreamMovieListUsecase)
+
 def get_movie_detail_interactor(injector: Injector = Depends(get_injector)):
+    if env_vars.DYNAMODB_ASYNC_ENABLED:
+        return injector.get(AsyncGetMovieDetailUsecase)
     return injector.get(GetMovieDetailUsecase)
 
+def get_movie_details_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(GetMovieDetailsUsecase)
+
+def get_movie_cache_stats_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(GetMovieCacheStatsUsecase)
+
+def get_top_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(GetTopMoviesUsecase)
+
+def query_movie_range_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(QueryMovieRangeUsecase)
+
+def search_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(SearchMoviesUsecase)
+
+def autocomplete_movie_titles_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(AutocompleteMovieTitlesUsecase)
+
+def count_movies_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(CountMoviesUsecase)
+
+def get_movie_aggregates_interactor(injector: Injector = Depends(get_injector)):
+    return injector.get(GetMovieAggregatesUsecase)
+
 @movie_router.get("/query-movies", status_code=status.HTTP_200_OK, tags=["Movie"])
 async def movie_list(
     year: str,
-    token: str = Depends(oauth2_scheme),
-    usecase: Usecase = Depends(query_movies_interactor)
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = None,
+    fields: str | None = Query(default=None, description="year,title,plot,rating のカンマ区切り"),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase | AsyncUsecase = Depends(query_movies_interactor)
+):
+    return await execute(usecase, year, limit, cursor, fields)
+
+@movie_router.get("/query-range", status_code=status.HTTP_200_OK, tags=["Movie"], response_class=NDJSONResponse)
+async def movie_range(
+    year_from: int = Query(ge=1972, le=2100),
+    year_to: int = Query(ge=1972, le=2100),
+    fields: str | None = Query(default=None, description="year,title,plot,rating のカンマ区切り"),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(query_movie_range_interactor)
 ):
-    return usecase.execute(year)
+    return NDJSONResponse(usecase.execute(year_from, year_to, fields, env_vars.MOVIE_RANGE_CONCURRENCY))
 
 @movie_router.get("/list", status_code=status.HTTP_200_OK, tags=["Movie"])
 async def movie_list(
-    token: str = Depends(oauth2_scheme),
-    usecase: Usecase = Depends(get_movie_list_interactor)
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = None,
+    fields: str | None = Query(default=None, description="year,title,plot,rating のカンマ区切り"),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase | AsyncUsecase = Depends(get_movie_list_interactor)
+):
+    return await execute(usecase, limit, cursor, fields)
+
+@movie_router.get("/list/stream", status_code=status.HTTP_200_OK, tags=["Movie"], response_class=NDJSONResponse)
+async def movie_list_stream(
+    page_size: int | None = Query(default=None, ge=1, le=1000),
+    fields: str | None = Query(default=None, description="year,title,plot,rating のカンマ区切り"),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(stream_movie_list_interactor)
+):
+    return NDJSONResponse(usecase.execute(page_size, fields))
+
+@movie_router.get("/top", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def top_movies(
+    limit: int = Query(default=10, ge=1, le=100),
+    year: int | None = None,
+    fields: str | None = Query(default=None, description="year,title,plot,rating のカンマ区切り"),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(get_top_movies_interactor)
 ):
-    return usecase.execute()
+    return await execute(usecase, limit, year, fields)
+
+@movie_router.get("/search", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def search_movies(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(search_movies_interactor)
+):
+    return await execute(usecase, q, limit, cursor)
+
+@movie_router.get("/autocomplete", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def autocomplete_movie_titles(
+    prefix: str = Query(min_length=1, max_length=30),
+    limit: int = Query(default=10, ge=1, le=50),
+    year: int | None = None,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(autocomplete_movie_titles_interactor)
+):
+    return await execute(usecase, prefix, limit, year)
+
+@movie_router.get("/count", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def count_movies(
+    year: int | None = None,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(count_movies_interactor)
+):
+    return await execute(usecase, year)
+
+@movie_router.get("/aggregate", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def movie_aggregates(
+    year: int | None = None,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(get_movie_aggregates_interactor)
+):
+    return await execute(usecase, year)
 
 @movie_router.get("/detail", status_code=status.HTTP_200_OK, tags=["Movie"])
 async def movie_detail(
     year: str = Form(),
     title: str = Form(),
-    token: str = Depends(oauth2_scheme),
-    usecase: Usecase = Depends(get_movie_detail_interactor),
+    claims: dict = Depends(verify_token),
+    usecase: Usecase | AsyncUsecase = Depends(get_movie_detail_interactor),
+):
+    return await execute(usecase, year, title)
+
+@movie_router.post("/batch-detail", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def movie_details(
+    body: MovieKeyList,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(get_movie_details_interactor),
 ):
-    return usecase.execute(year, title)
+    return await execute(usecase, body.keys)
 
 @movie_router.put("/add", status_code=status.HTTP_201_CREATED, tags=["Movie"])
 async def add_movie(
     form: MovieForm,
-    token: str = Depends(oauth2_scheme),
-    usecase: Usecase = Depends(add_movie_interactor)
+    claims: dict = Depends(verify_token),
+    usecase: Usecase | AsyncUsecase = Depends(add_movie_interactor)
+):
+    return await execute(usecase, form)
+
+@movie_router.post("/bulk-import", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def import_movies(
+    request: Request,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(import_movies_interactor)
+):
+    body = await request.body()
+    return await execute(usecase, body, request.headers.get("content-type", ""))
+
+@movie_router.post("/batch-delete", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def delete_movies(
+    body: MovieKeyList,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(delete_movies_interactor)
 ):
-    return usecase.execute(form)
+    return await execute(usecase, body.keys)
+
+@movie_router.post("/transact", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def transact_movies(
+    body: MovieTransaction,
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(transact_movies_interactor)
+):
+    return await execute(usecase, body.operations)
 
 @movie_router.put("/edit", status_code=status.HTTP_200_OK, tags=["Movie"])
 async def add_movie(
     form: MovieForm,
-    token: str = Depends(oauth2_scheme),
-    usecase: Usecase = Depends(add_movie_interactor)
+    claims: dict = Depends(verify_token),
+    usecase: Usecase | AsyncUsecase = Depends(add_movie_interactor)
+):
+    return await execute(usecase, form)
+
+@movie_router.get("/cache-stats", status_code=status.HTTP_200_OK, tags=["Movie"])
+async def movie_cache_stats(
+    claims: dict = Depends(verify_token),
+    usecase: Usecase = Depends(get_movie_cache_stats_interactor)
 ):
-    return usecase.execute(form)
\ No newline at end of file
+    return await execute(usecase)
\ No newline at end of file
@@ -1,18 +1,80 @@
+import asyncio
 import boto3
+import functools
+import jwt
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+from botocore.config import Config
 from pydantic import EmailStr
 from domain.entity.user import UserSignUp, UserSignIn, UserVerify, ChangePassword, ConfirmForgotPassword
 from .config import env_vars
+from .user_profile_cache import UserProfileCache
 
 AWS_REGION_NAME = env_vars.AWS_REGION_NAME
 AWS_COGNITO_APP_CLIENT_ID = env_vars.AWS_COGNITO_APP_CLIENT_ID
 AWS_COGNITO_USER_POOL_ID = env_vars.AWS_COGNITO_USER_POOL_ID
 
+_client_lock = threading.Lock()
+_client = None
+
+# Cognito の呼び出し専用のスレッドプール。応答が遅い場合も、他のリクエストが使う
+# イベントループや既定のスレッドプールを塞がないようにする
+_cognito_executor = ThreadPoolExecutor(
+    max_workers=env_vars.COGNITO_EXECUTOR_WORKERS,
+    thread_name_prefix="cognito",
+)
+
+
+def cognito_config() -> Config:
+    """Cognito クライアントの接続設定"""
+    return Config(
+        region_name=AWS_REGION_NAME,
+        max_pool_connections=env_vars.COGNITO_MAX_POOL_CONNECTIONS,
+        connect_timeout=env_vars.COGNITO_CONNECT_TIMEOUT,
+        read_timeout=env_vars.COGNITO_READ_TIMEOUT,
+        tcp_keepalive=True,
+        retries={"mode": "standard", "max_attempts": env_vars.COGNITO_MAX_ATTEMPTS},
+    )
+
+
+def get_cognito_client():
+    """プロセス内で共有する cognito-idp クライアントを返す
+
+    boto3 のクライアントはスレッドセーフなため、全てのリクエストで使い回す。
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = boto3.client("cognito-idp", config=cognito_config())
+    return _client
+
+
+async def run_cognito(func, *args, **kwargs):
+    """Cognito を呼び出す同期関数を専用のスレッドプールで実行する"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cognito_executor, functools.partial(func, *args, **kwargs))
+
+
+def _token_subject(access_token: str) -> str | None:
+    """Cognito が受け付けたアクセストークンから sub を読む（署名の検証は不要）"""
+    try:
+        return jwt.decode(access_token, options={"verify_signature": False}).get("sub")
+    except jwt.InvalidTokenError:
+        return None
+
 
 class AWS_Cognito:
-    def __init__(self):
-        self.client = boto3.client("cognito-idp", region_name=AWS_REGION_NAME)
+    def __init__(self, client=None, profiles: UserProfileCache | None = None):
+        self.client = client if client is not None else get_cognito_client()
+        if profiles is None:
+            profiles = UserProfileCache(
+                env_vars.USER_CACHE_MAX_SIZE if env_vars.USER_CACHE_ENABLED else 0,
+                env_vars.USER_CACHE_TTL_SECONDS,
+            )
+        self.profiles = profiles
 
     # ユーザ登録
     def user_signup(self, user: UserSignUp):
@@ -45,6 +107,7 @@ class AWS_Cognito:
             Username=data.email,
             ConfirmationCode=data.confirmation_code,
         )
+        self.profiles.invalidate(email=data.email)
         return response
 
     # 認証コード再送信
@@ -63,6 +126,13 @@ class AWS_Cognito:
         )
         return response
 
+    # ユーザ属性取得（キャッシュ）
+    def get_user_attributes(self, email: EmailStr) -> dict:
+        def load():
+            response = self.check_user_exists(email)
+            return {attribute["Name"]: attribute["Value"] for attribute in response["UserAttributes"]}
+        return self.profiles.get(email, load)
+
     # ログイン
     def user_signin(self, data: UserSignIn):
         response = self.client.initiate_auth(
@@ -100,6 +170,7 @@ class AWS_Cognito:
             ProposedPassword=data.new_password,
             AccessToken=data.access_token
         )
+        self.profiles.invalidate(sub=_token_subject(data.access_token))
         return response
 
     # アクセストークン再発行
@@ -118,10 +189,18 @@ class AWS_Cognito:
         response = self.client.global_sign_out(
             AccessToken=access_token
         )
+        self.profiles.invalidate(sub=_token_subject(access_token))
         return response
 
-    def list_user(self):
-        response = self.client.list_users(
-            UserPoolId=AWS_COGNITO_USER_POOL_ID
-        )
+    def list_user(self, limit=None, pagination_token=None, filter=None, attributes=None):
+        params = {"UserPoolId": AWS_COGNITO_USER_POOL_ID}
+        if limit is not None:
+            params["Limit"] = limit
+        if pagination_token is not None:
+            params["PaginationToken"] = pagination_token
+        if filter is not None:
+            params["Filter"] = filter
+        if attributes is not None:
+            params["AttributesToGet"] = attributes
+        response = self.client.list_users(**params)
         return response
\ No newline at end of file
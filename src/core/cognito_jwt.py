@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+import urllib.request
+from logging import getLogger
+from typing import Callable
+
+import jwt
+
+LOGGER = getLogger(__name__)
+
+
+class JWKSUnavailableError(Exception):
+    """JWKS を一度も取得できておらず、トークンを検証できない"""
+
+
+def fetch_jwks(url: str, timeout: float = 5) -> dict:
+    """JWKS (JSON Web Key Set) を URL から取得する"""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.load(response)
+
+
+class JWKSCache:
+    """プロセス内で共有する JWKS のキャッシュ
+
+    起動後はバックグラウンドで定期的に取り直し、未知の kid のトークンを受け取った場合は
+    その場で 1 回だけ取り直す（鍵のローテーション直後向け）。未知の kid による取り直しは
+    min_refetch_interval 秒に 1 回までとし、不正なトークンで Cognito に負荷をかけないようにする。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], dict],
+        refresh_interval: float = 3600,
+        min_refetch_interval: float = 30,
+    ):
+        """
+        Args:
+            fetch (Callable[[], dict]): JWKS を返す関数（テストではローカルの JWKS を返す関数を渡す）
+            refresh_interval (float): バックグラウンドで取り直す間隔（秒）。0 の場合は取り直さない
+            min_refetch_interval (float): 未知の kid による取り直しの最小間隔（秒）
+        """
+        self.__fetch = fetch
+        self.__refresh_interval = refresh_interval
+        self.__min_refetch_interval = min_refetch_interval
+        self.__lock = threading.Lock()
+        self.__keys = {}
+        # 最後に取得に成功した時刻と、成功・失敗にかかわらず最後に取得を試みた時刻
+        self.__fetched_at = None
+        self.__attempted_at = None
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def get_key(self, kid: str):
+        """kid に対応する公開鍵を返す（見つからない場合は None）
+
+        Raises:
+            JWKSUnavailableError: JWKS を一度も取得できていない場合
+        """
+        key = self.__keys.get(kid)
+        if key is not None:
+            return key
+        with self.__lock:
+            key = self.__keys.get(kid)
+            if key is not None:
+                return key
+            if self.__attempted_at is not None and time.monotonic() - self.__attempted_at < self.__min_refetch_interval:
+                if self.__fetched_at is None:
+                    # 取得に失敗し続けている間は、鍵がないことを不正なトークンとして扱わない
+                    raise JWKSUnavailableError("JWKS has not been fetched yet")
+                return None
+            try:
+                self.__refresh()
+            except Exception as e:
+                if self.__fetched_at is None:
+                    raise JWKSUnavailableError(f"Couldn't fetch JWKS: {e}") from e
+                # 取得済みの鍵があれば、取り直しに失敗しても未知の kid として扱う
+                LOGGER.error("Couldn't refresh JWKS. Here's why: %s", e)
+                return None
+            return self.__keys.get(kid)
+
+    def refresh(self) -> None:
+        """JWKS を取り直す"""
+        with self.__lock:
+            self.__refresh()
+
+    def start(self) -> None:
+        """バックグラウンドでの定期的な取り直しを始める"""
+        if self.__refresh_interval <= 0 or self.__thread is not None:
+            return
+        self.__thread = threading.Thread(target=self.__run, name="jwks-refresh", daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stop.set()
+
+    def __run(self) -> None:
+        while not self.__stop.wait(self.__refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # 取得に失敗しても既存の鍵で検証を続ける
+                LOGGER.error("Couldn't refresh JWKS. Here's why: %s", e)
+
+    def __refresh(self) -> None:
+        self.__attempted_at = time.monotonic()
+        jwk_set = jwt.PyJWKSet.from_dict(self.__fetch())
+        # 読み込み側はロックを取らないため、辞書ごと差し替える
+        self.__keys = {key.key_id: key for key in jwk_set.keys}
+        self.__fetched_at = time.monotonic()
+
+
+class CognitoTokenVerifier:
+    """Cognito のアクセストークン・ID トークンを JWKS でローカルに検証する
+
+    署名・exp・iss・token_use と、アクセストークンは client_id、ID トークンは aud を確認する。
+    """
+
+    def __init__(self, jwks: JWKSCache, issuer: str, client_id: str, leeway: float = 0):
+        self.__jwks = jwks
+        self.__issuer = issuer
+        self.__client_id = client_id
+        self.__leeway = leeway
+
+    def verify(self, token: str, token_uses: tuple[str, ...] = ("access", "id")) -> dict:
+        """トークンを検証してクレームを返す
+
+        Args:
+            token (str): JWT
+            token_uses (tuple[str, ...]): 受け付ける token_use
+
+        Returns:
+            dict: クレーム
+
+        Raises:
+            jwt.InvalidTokenError: 検証に失敗した場合
+            JWKSUnavailableError: JWKS を一度も取得できていない場合
+        """
+        header = jwt.get_unverified_header(token)
+        key = self.__jwks.get_key(header.get("kid"))
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown key id")
+        claims = jwt.decode(
+            token,
+            key=key.key,
+            algorithms=["RS256"],
+            issuer=self.__issuer,
+            leeway=self.__leeway,
+            options={"require": ["exp", "iss", "token_use"], "verify_aud": False},
+        )
+        token_use = claims["token_use"]
+        if token_use not in token_uses:
+            raise jwt.InvalidTokenError(f"Unexpected token_use: {token_use}")
+        audience = claims.get("client_id") if token_use == "access" else claims.get("aud")
+        if audience != self.__client_id:
+            raise jwt.InvalidAudienceError("Token was not issued for this client")
+        return claims
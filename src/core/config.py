@@ -1,13 +1,80 @@
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
 
 
 class Settings(BaseSettings):
     AWS_REGION_NAME: str
     AWS_COGNITO_APP_CLIENT_ID: str
     AWS_COGNITO_USER_POOL_ID: str
+    # Cognito クライアントの接続設定（プロセス内で共有する）
+    COGNITO_MAX_POOL_CONNECTIONS: int = 20
+    COGNITO_CONNECT_TIMEOUT: float = 2
+    COGNITO_READ_TIMEOUT: float = 5
+    COGNITO_MAX_ATTEMPTS: int = 3
+    # Cognito の呼び出しを実行するスレッド数（同時に呼び出せる数の上限）
+    COGNITO_EXECUTOR_WORKERS: int = 20
     APP_ENV: str
+    # DynamoDB の接続先とテーブル名（エンドポイント未指定の場合は AWS の既定エンドポイント）
+    DYNAMODB_ENDPOINT_URL: str | None = "http://localhost:3000"
+    DYNAMODB_TABLE_NAME: str = "dev-manage-photo"
+    # DynamoDB クライアントのタイムアウト（秒）・リトライ回数・TCP キープアライブ
+    DYNAMODB_CONNECT_TIMEOUT: float = 2
+    DYNAMODB_READ_TIMEOUT: float = 5
+    DYNAMODB_MAX_ATTEMPTS: int = 3
+    DYNAMODB_TCP_KEEPALIVE: bool = True
+    # DynamoDB テーブルハンドルの再確認間隔（秒）。0 の場合は再確認しない
+    DYNAMODB_TABLE_TTL_SECONDS: int = 300
+    # HTTP コネクションプールの上限（同期・非同期共通）
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = 50
+    # 非同期 (aioboto3) リポジトリを使用するかどうか
+    DYNAMODB_ASYNC_ENABLED: bool = False
+    # 同期の映画リポジトリの実装（"dynamodb" または負荷試験・ベンチマーク用の "memory"）
+    MOVIE_REPO_BACKEND: Literal["dynamodb", "memory"] = "dynamodb"
+    # 低レベルクライアントと専用デコーダで映画を読み込むかどうか
+    DYNAMODB_FAST_DECODE: bool = False
+    # BatchWriteItem / BatchGetItem の同時実行数と最大試行回数
+    DYNAMODB_BATCH_CONCURRENCY: int = 4
+    DYNAMODB_BATCH_MAX_ATTEMPTS: int = 5
+    # 映画一覧 (GSIndex1) のパーティション分割数。1 の場合は分割しない
+    # 変更した場合は python -m scripts.migrate_movie_index で既存データを書き換えること
+    MOVIE_LIST_SHARDS: int = 1
+    # 公開年ごとの件数と評価の合計を書き込みのたびに更新するかどうか
+    # 既存のテーブルで有効にした場合は python -m scripts.rebuild_movie_aggregates で作り直すこと
+    # （集計のキーを公開年ごとのパーティション Aggregate|{year} に変更した後も同様）
+    MOVIE_AGGREGATES_ENABLED: bool = False
+    # タイトル・あらすじのキーワード検索と公開年をまたぐタイトル補完
+    # （起動時にテーブル全体を Scan してインデックスを作る）
+    # インデックスはプロセス内にあり、自プロセスの書き込みしか反映しないため、
+    # ワーカーが 1 つの場合のみ有効にすること（他のワーカーの書き込みは再起動まで反映されない）
+    # n-gram は部分一致に使う文字数。0 の場合は単語としての一致のみ
+    MOVIE_SEARCH_ENABLED: bool = False
+    MOVIE_SEARCH_NGRAM: int = 2
+    # 公開年の範囲検索で同時に実行する Query の数
+    MOVIE_RANGE_CONCURRENCY: int = 8
+    # アクセストークン・ID トークンのローカル検証（JWKS の URL 未指定の場合はユーザープールの URL）
+    AUTH_VERIFY_TOKENS: bool = True
+    # 管理者向けエンドポイントに必要なトークンの custom:role の値
+    AUTH_ADMIN_ROLE: str = "admin"
+    COGNITO_JWKS_URL: str | None = None
+    COGNITO_JWKS_REFRESH_SECONDS: float = 3600
+    COGNITO_JWKS_MIN_REFETCH_SECONDS: float = 30
+    COGNITO_TOKEN_LEEWAY_SECONDS: float = 0
+    # ユーザ属性 (AdminGetUser) のキャッシュ（件数・TTL 秒）
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 300
+    # 映画の読み込みキャッシュ（件数・TTL 秒・存在しない場合の TTL 秒）
+    # プロセス単位のため、複数ワーカーでは他のワーカーの書き込みが TTL の間反映されない
+    MOVIE_CACHE_ENABLED: bool = False
+    MOVIE_CACHE_MAX_SIZE: int = 10000
+    MOVIE_CACHE_TTL_SECONDS: float = 60
+    MOVIE_CACHE_NEGATIVE_TTL_SECONDS: float = 10
+    # テーブルエクスポート（並列 Scan）の設定。読み込みキャパシティ 0 は無制限
+    EXPORT_SCAN_SEGMENTS: int = 4
+    EXPORT_PAGE_SIZE: int = 500
+    EXPORT_MAX_READ_CAPACITY: float = 0
 
     model_config = SettingsConfigDict(env_file=".env")
     load_dotenv()
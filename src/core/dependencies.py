@@ -1,8 +1,18 @@
-from injector import Injector, inject, Module, provider
+import threading
+from logging import getLogger
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from injector import Injector, inject, Module, provider, singleton
 from .aws_cognito import AWS_Cognito
+from .cognito_jwt import CognitoTokenVerifier, JWKSCache, JWKSUnavailableError, fetch_jwks
+from .config import env_vars
 from usecase import interface as i_interface
 import repository as repo
 
+LOGGER = getLogger(__name__)
+
 
 class DependencyInjector():
     _instance = None
@@ -26,15 +36,129 @@ class DependencyInjector():
 
 di_injector = DependencyInjector()
 
+_aws_cognito_lock = threading.Lock()
+_aws_cognito = None
+
 def get_aws_cognito() -> AWS_Cognito:
-    return AWS_Cognito()
+    # クライアントとコネクションプールを使い回すため、プロセス内で 1 つだけ作る
+    global _aws_cognito
+    if _aws_cognito is None:
+        with _aws_cognito_lock:
+            if _aws_cognito is None:
+                _aws_cognito = AWS_Cognito()
+    return _aws_cognito
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+_token_verifier_lock = threading.Lock()
+_token_verifier = None
+
+def get_token_verifier() -> CognitoTokenVerifier:
+    # JWKS をプロセス内で共有するため、検証器は 1 つだけ作る
+    global _token_verifier
+    if _token_verifier is None:
+        with _token_verifier_lock:
+            if _token_verifier is None:
+                issuer = f"https://cognito-idp.{env_vars.AWS_REGION_NAME}.amazonaws.com/{env_vars.AWS_COGNITO_USER_POOL_ID}"
+                jwks_url = env_vars.COGNITO_JWKS_URL or f"{issuer}/.well-known/jwks.json"
+                jwks = JWKSCache(
+                    lambda: fetch_jwks(jwks_url),
+                    refresh_interval=env_vars.COGNITO_JWKS_REFRESH_SECONDS,
+                    min_refetch_interval=env_vars.COGNITO_JWKS_MIN_REFETCH_SECONDS,
+                )
+                jwks.start()
+                _token_verifier = CognitoTokenVerifier(
+                    jwks,
+                    issuer,
+                    env_vars.AWS_COGNITO_APP_CLIENT_ID,
+                    leeway=env_vars.COGNITO_TOKEN_LEEWAY_SECONDS,
+                )
+    return _token_verifier
+
+def verify_token(
+    token: str = Depends(oauth2_scheme),
+    verifier: CognitoTokenVerifier = Depends(get_token_verifier),
+) -> dict:
+    """Bearer トークンをローカルで検証し、クレームを返す
+
+    未知の kid の場合は JWKS を取り直すことがあるため、同期関数としてスレッドプールで実行させる。
+    """
+    if not env_vars.AUTH_VERIFY_TOKENS:
+        return {}
+    try:
+        return verifier.verify(token)
+    except jwt.InvalidTokenError as e:
+        raise HTTPException(
+            status_code=401,
+            detail=f"Invalid token: {e}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    except JWKSUnavailableError as e:
+        # JWKS を取得できない間は認証エラーではなく一時的な障害として返す
+        LOGGER.error("Couldn't verify token. Here's why: %s", e)
+        raise HTTPException(status_code=503, detail="Token verification is unavailable")
+
+def require_admin(claims: dict = Depends(verify_token)) -> dict:
+    """管理者 (custom:role) のトークンのみ通す
+
+    custom:role は ID トークンに含まれる（アクセストークンで使う場合はトークン生成前の Lambda トリガーで追加する）。
+    """
+    if not env_vars.AUTH_VERIFY_TOKENS:
+        return claims
+    if claims.get("custom:role") != env_vars.AUTH_ADMIN_ROLE:
+        raise HTTPException(status_code=403, detail="Administrator role is required")
+    return claims
 
 class RepositoryModule(Module):
     def __init__(self) -> None:
         pass
 
+    @singleton
+    @provider
+    def movie_search_index(self) -> i_interface.IMovieSearchIndex:
+        return repo.MovieSearchIndex(ngram=env_vars.MOVIE_SEARCH_NGRAM)
+
+    @singleton
+    @provider
+    def movie_title_index(self) -> i_interface.IMovieTitleIndex:
+        return repo.MovieTitleIndex()
+
+    @singleton
+    @provider
+    def movie_repo(
+        self,
+        search_index: i_interface.IMovieSearchIndex,
+        title_index: i_interface.IMovieTitleIndex,
+    ) -> i_interface.IMovieRepo:
+        if env_vars.MOVIE_REPO_BACKEND == "memory":
+            movie_repo = repo.InMemoryMovieRepo()
+        elif env_vars.DYNAMODB_FAST_DECODE:
+            movie_repo = repo.FastMovieRepo()
+        else:
+            movie_repo = repo.MovieRepo()
+        if env_vars.MOVIE_SEARCH_ENABLED:
+            movie_repo = repo.IndexedMovieRepo(movie_repo, [search_index, title_index])
+        if env_vars.MOVIE_CACHE_ENABLED:
+            return repo.CachedMovieRepo(
+                movie_repo,
+                maxsize=env_vars.MOVIE_CACHE_MAX_SIZE,
+                ttl=env_vars.MOVIE_CACHE_TTL_SECONDS,
+                negative_ttl=env_vars.MOVIE_CACHE_NEGATIVE_TTL_SECONDS,
+            )
+        return movie_repo
+
     @provider
-    def movie_repo(self) -> i_interface.IMovieRepo:
-        return repo.MovieRepo()
+    def async_movie_repo(
+        self,
+        movie_repo: i_interface.IMovieRepo,
+        search_index: i_interface.IMovieSearchIndex,
+        title_index: i_interface.IMovieTitleIndex,
+    ) -> i_interface.IAsyncMovieRepo:
+        async_movie_repo = repo.AsyncMovieRepo()
+        if env_vars.MOVIE_SEARCH_ENABLED:
+            async_movie_repo = repo.IndexedAsyncMovieRepo(async_movie_repo, [search_index, title_index])
+        if isinstance(movie_repo, repo.CachedMovieRepo):
+            # 同期リポジトリのキャッシュを読むエンドポイントに、非同期での書き込みを反映する
+            return repo.CacheInvalidatingAsyncMovieRepo(async_movie_repo, movie_repo)
+        return async_movie_repo
 
 injector = Injector([RepositoryModule()])
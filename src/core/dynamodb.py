@@ -0,0 +1,230 @@
+import asyncio
+import base64
+import binascii
+import json
+import threading
+import time
+from contextlib import AsyncExitStack
+from logging import getLogger
+from typing import Any, Callable
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from .config import env_vars
+
+
+LOGGER = getLogger(__name__)
+
+_resource_lock = threading.Lock()
+_resource = None
+_client = None
+# スレッドごとのリソース（boto3 のリソースはスレッドセーフではない）
+_local = threading.local()
+
+
+def dynamodb_config() -> Config:
+    """DynamoDB クライアント共通の接続設定"""
+    return Config(
+        region_name=env_vars.AWS_REGION_NAME,
+        max_pool_connections=env_vars.DYNAMODB_MAX_POOL_CONNECTIONS,
+        connect_timeout=env_vars.DYNAMODB_CONNECT_TIMEOUT,
+        read_timeout=env_vars.DYNAMODB_READ_TIMEOUT,
+        tcp_keepalive=env_vars.DYNAMODB_TCP_KEEPALIVE,
+        retries={"mode": "standard", "max_attempts": env_vars.DYNAMODB_MAX_ATTEMPTS},
+    )
+
+
+def get_dynamodb_resource():
+    """呼び出したスレッド用の boto3 の DynamoDB リソースを返す
+
+    boto3 のリソースはスレッドセーフではないため、スレッドごとに作る。内部のクライアント
+    （型変換・コネクションプール）はスレッドセーフなため、プロセス内で 1 つを共有し、
+    セッション生成・エンドポイント解決・コネクションプールの作成は初回のみ行う。
+    """
+    resource = getattr(_local, "resource", None)
+    if resource is None:
+        shared = _get_shared_resource()
+        resource = type(shared)(client=shared.meta.client)
+        _local.resource = resource
+    return resource
+
+
+def _get_shared_resource():
+    global _resource
+    if _resource is None:
+        with _resource_lock:
+            if _resource is None:
+                _resource = boto3.resource(
+                    "dynamodb",
+                    endpoint_url=env_vars.DYNAMODB_ENDPOINT_URL,
+                    config=dynamodb_config(),
+                )
+    return _resource
+
+
+def get_dynamodb_client():
+    """プロセス内で共有する低レベルの DynamoDB クライアントを返す
+
+    リソースのクライアントと異なり、型変換 (TypeSerializer / TypeDeserializer) を行わない。
+    """
+    global _client
+    if _client is None:
+        with _resource_lock:
+            if _client is None:
+                _client = boto3.client(
+                    "dynamodb",
+                    endpoint_url=env_vars.DYNAMODB_ENDPOINT_URL,
+                    config=dynamodb_config(),
+                )
+    return _client
+
+
+class TableHandle:
+    """プロセス内で共有する DynamoDB テーブルハンドル
+
+    DescribeTable (Table.load) はハンドル取得時に一度だけ実行し、
+    以降は TTL 経過時か ResourceNotFoundException 発生時のみ再確認する。
+    テーブルの確認状態はプロセス内で共有し、Table オブジェクトはスレッドごとに作る。
+    """
+
+    def __init__(self, resource_factory: Callable[[], Any], table_name: str, ttl_seconds: int = 0):
+        """
+        Args:
+            resource_factory (Callable[[], Any]): 呼び出したスレッド用の boto3 の DynamoDB リソースを返す関数
+            table_name (str): テーブル名
+            ttl_seconds (int): 再確認までの秒数（0 以下の場合は再確認しない）
+        """
+        self.__resource_factory = resource_factory
+        self.__table_name = table_name
+        self.__ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__verified = False
+        self.__loaded_at = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.__table_name
+
+    @property
+    def resource(self):
+        """呼び出したスレッド用のリソースを返す"""
+        return self.__resource_factory()
+
+    def get(self):
+        """呼び出したスレッド用の、検証済みのテーブルを返す
+
+        Raises:
+            ClientError: テーブルが存在しない場合など
+        """
+        if self.__verified and not self.__expired():
+            return self.__thread_table()
+        with self.__lock:
+            if not self.__verified or self.__expired():
+                table = self.__resource_factory().Table(self.__table_name)
+                table.load()
+                self.__local.table = table
+                self.__verified = True
+                self.__loaded_at = time.monotonic()
+        return self.__thread_table()
+
+    def set(self, table) -> None:
+        """作成直後のテーブルを登録する"""
+        with self.__lock:
+            self.__local.table = table
+            self.__verified = True
+            self.__loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """次回の get() でテーブルを再確認させる"""
+        with self.__lock:
+            self.__verified = False
+
+    def handle_error(self, err: ClientError) -> None:
+        """テーブルが見つからないエラーの場合はハンドルを破棄する"""
+        if err.response["Error"]["Code"] == "ResourceNotFoundException":
+            LOGGER.warning("Table %s not found, invalidating cached handle", self.__table_name)
+            self.invalidate()
+
+    def __thread_table(self):
+        table = getattr(self.__local, "table", None)
+        if table is None:
+            # 確認済みのため DescribeTable は呼ばない（Table の作成では API を呼び出さない）
+            table = self.__resource_factory().Table(self.__table_name)
+            self.__local.table = table
+        return table
+
+    def __expired(self) -> bool:
+        if self.__ttl_seconds <= 0:
+            return False
+        return time.monotonic() - self.__loaded_at >= self.__ttl_seconds
+
+
+class AsyncTableHandle:
+    """非同期 (aioboto3) のテーブルハンドル
+
+    リソースはイベントループ上で最初に使われた時に生成し、
+    close() まで HTTP コネクションプールを使い回す。
+    """
+
+    def __init__(self, resource_context_factory: Callable[[], Any], table_name: str):
+        """
+        Args:
+            resource_context_factory (Callable[[], Any]): aioboto3 のリソース (async context manager) を返す関数
+            table_name (str): テーブル名
+        """
+        self.__resource_context_factory = resource_context_factory
+        self.__table_name = table_name
+        self.__lock = asyncio.Lock()
+        self.__stack = None
+        self.__table = None
+
+    @property
+    def name(self) -> str:
+        return self.__table_name
+
+    async def get(self):
+        if self.__table is not None:
+            return self.__table
+        async with self.__lock:
+            if self.__table is None:
+                stack = AsyncExitStack()
+                resource = await stack.enter_async_context(self.__resource_context_factory())
+                self.__table = await resource.Table(self.__table_name)
+                self.__stack = stack
+            return self.__table
+
+    async def close(self) -> None:
+        async with self.__lock:
+            if self.__stack is not None:
+                await self.__stack.aclose()
+            self.__stack = None
+            self.__table = None
+
+
+def encode_cursor(last_evaluated_key: dict | None) -> str | None:
+    """LastEvaluatedKey を不透明なカーソル文字列に変換する"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> dict | None:
+    """カーソル文字列を ExclusiveStartKey に戻す
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as err:
+        raise ValueError("Invalid cursor") from err
+    if not isinstance(key, dict) or not all(isinstance(v, str) for v in key.values()):
+        raise ValueError("Invalid cursor")
+    return key
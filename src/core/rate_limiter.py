@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """スレッドセーフなトークンバケット
+
+    消費量が事前に分からない処理（Scan の消費キャパシティなど）のために、
+    実行後に consume() で実際の消費量を差し引き、次の acquire() で待機する。
+    """
+
+    def __init__(self, rate_per_second: float):
+        """
+        Args:
+            rate_per_second (float): 1 秒あたりの許容量（0 以下の場合は無制限）
+        """
+        self.__rate = rate_per_second
+        self.__tokens = rate_per_second
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """トークンが正になるまで待機する"""
+        if self.__rate <= 0:
+            return
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens > 0:
+                    return
+                wait = -self.__tokens / self.__rate
+            time.sleep(wait)
+
+    def consume(self, amount: float) -> None:
+        """実際の消費量を差し引く"""
+        if self.__rate <= 0:
+            return
+        with self.__lock:
+            self.__refill()
+            self.__tokens -= amount
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.__tokens = min(self.__rate, self.__tokens + (now - self.__updated_at) * self.__rate)
+        self.__updated_at = now
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+# キャッシュに存在しないことを表す値（None をキャッシュできるようにするため）
+MISSING = object()
+
+
+class TTLCache:
+    """スレッドセーフな LRU + TTL キャッシュ
+
+    None などの「存在しない」結果も negative_ttl でキャッシュできる。
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float | None = None):
+        """
+        Args:
+            maxsize (int): 最大件数（超えた場合は最も古く使われたものから破棄）
+            ttl (float): 有効期間（秒）
+            negative_ttl (float | None): None を保存する場合の有効期間（秒）
+        """
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.__data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """値を返す。存在しないか期限切れの場合は MISSING を返す"""
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.__data.move_to_end(key)
+                    self.__hits += 1
+                    return value
+                del self.__data[key]
+            self.__misses += 1
+            return MISSING
+
+    def peek(self, key: Hashable) -> Any:
+        """ヒット率や LRU の順序を変えずに値を返す。存在しないか期限切れの場合は MISSING を返す"""
+        with self.__lock:
+            entry = self.__data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return MISSING
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        ttl = self.__negative_ttl if value is None else self.__ttl
+        if ttl <= 0 or self.__maxsize <= 0:
+            return
+        with self.__lock:
+            self.__data[key] = (time.monotonic() + ttl, value)
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.__maxsize:
+                self.__data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self.__lock:
+            self.__data.pop(key, None)
+
+    def remove_if(self, predicate: Callable[[Hashable], bool]) -> None:
+        """条件に一致するキーをすべて削除する"""
+        with self.__lock:
+            for key in [key for key in self.__data if predicate(key)]:
+                del self.__data[key]
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+
+    def stats(self) -> dict:
+        with self.__lock:
+            total = self.__hits + self.__misses
+            return {
+                "size": len(self.__data),
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_rate": self.__hits / total if total else 0.0,
+            }
@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+from .ttl_cache import MISSING, TTLCache
+
+
+class UserProfileCache:
+    """Cognito のユーザ属性 (AdminGetUser の結果) を email と sub をキーに持つ LRU + TTL キャッシュ
+
+    同じユーザの読み込みが同時に重なった場合は 1 回だけ読み込み、他の呼び出しはその結果を待つ
+    (single-flight)。AdminGetUser はレート制限が低いため、アクセスが集中しても呼び出しを増やさない。
+    読み込み中に invalidate された場合は、読み込んだ（古い可能性のある）属性をキャッシュに保存しない。
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Args:
+            maxsize (int): 最大件数（email と sub で 2 件ずつ使う）
+            ttl (float): 有効期間（秒）
+        """
+        self.__cache = TTLCache(maxsize, ttl)
+        self.__lock = threading.Lock()
+        self.__in_flight: dict[tuple[str, str], Future] = {}
+        self.__coalesced = 0
+        # invalidate した回数（読み込みの前後で変わっていれば保存しない）
+        self.__generation = 0
+
+    def get(self, email: str, load: Callable[[], dict]) -> dict:
+        """ユーザ属性の dict を返す。キャッシュにない場合は load で読み込む
+
+        Args:
+            email (str): メールアドレス
+            load (Callable[[], dict]): ユーザ属性の dict を返す関数（例外はそのまま呼び出し元に返す）
+
+        Returns:
+            dict: ユーザ属性
+        """
+        key = ("email", email.casefold())
+        attributes = self.__cache.get(key)
+        if attributes is not MISSING:
+            return dict(attributes)
+
+        with self.__lock:
+            future = self.__in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.__in_flight[key] = future
+                generation = self.__generation
+            else:
+                self.__coalesced += 1
+        if not leader:
+            return dict(future.result())
+
+        try:
+            attributes = load()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            with self.__lock:
+                if self.__generation == generation:
+                    self.__cache.set(key, attributes)
+                    if "sub" in attributes:
+                        self.__cache.set(("sub", attributes["sub"]), attributes)
+            future.set_result(attributes)
+            return dict(attributes)
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+
+    def invalidate(self, email: str | None = None, sub: str | None = None) -> None:
+        """ユーザのキャッシュを email・sub の両方のキーから破棄する"""
+        keys = set()
+        if email is not None:
+            keys.add(("email", email.casefold()))
+        if sub is not None:
+            keys.add(("sub", sub))
+        # 片方のキーしかわからない場合は、キャッシュしている属性からもう片方を求める
+        for key in list(keys):
+            attributes = self.__cache.peek(key)
+            if attributes is MISSING:
+                continue
+            if "email" in attributes:
+                keys.add(("email", attributes["email"].casefold()))
+            if "sub" in attributes:
+                keys.add(("sub", attributes["sub"]))
+        with self.__lock:
+            # 読み込み中のユーザの属性も保存させないよう、世代を進めてから破棄する
+            self.__generation += 1
+            for key in keys:
+                self.__cache.pop(key)
+
+    def clear(self) -> None:
+        self.__cache.clear()
+
+    def stats(self) -> dict:
+        return {**self.__cache.stats(), "coalesced": self.__coalesced}
@@ -1,11 +1,29 @@
 import json
+import zlib
 
 from decimal import Decimal
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from annotated_types import MinLen, MaxLen, Ge, Le
 from pydantic import BaseModel, EmailStr, Field, model_validator
 from pydantic.dataclasses import dataclass
 
+# 一覧 API の fields パラメータで指定できる項目
+MOVIE_FIELDS = ("year", "title", "plot", "rating")
+
+def parse_movie_fields(value: str | None) -> tuple[str, ...] | None:
+    """カンマ区切りの fields パラメータを MOVIE_FIELDS の順に並べて返す
+
+    Raises:
+        ValueError: 未知の項目が含まれる場合
+    """
+    if not value:
+        return None
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(MOVIE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in MOVIE_FIELDS if field in requested) or None
+
 @dataclass
 class MovieInfo:
     plot: str
@@ -24,6 +42,33 @@ class MovieForm(BaseModel):
             return cls(**json.loads(value))
         return value
 
+class MovieKey(BaseModel):
+    year: int
+    title: str
+
+class MovieKeyList(BaseModel):
+    keys: Annotated[list[MovieKey], MaxLen(1000)]
+
+class MovieOperation(BaseModel):
+    action: Literal["put", "update", "delete"]
+    year: Annotated[int, Field(ge=1972, le=2100)]
+    title: Annotated[str, MaxLen(30)]
+    plot: Annotated[str, MaxLen(30)] | None = None
+    rating: Annotated[float, Field(ge=0, le=5)] | None = None
+
+    @model_validator(mode='after')
+    def validate_values(self) -> "MovieOperation":
+        if self.action != "delete" and (self.plot is None or self.rating is None):
+            raise ValueError(f"plot and rating are required for {self.action}")
+        return self
+
+    def to_form(self) -> MovieForm:
+        return MovieForm(year=self.year, title=self.title, plot=self.plot, rating=self.rating)
+
+class MovieTransaction(BaseModel):
+    # TransactWriteItems の上限（集計の更新を含む）
+    operations: Annotated[list[MovieOperation], MinLen(1), MaxLen(100)]
+
 @dataclass
 class Movie:
     year: int
@@ -32,31 +77,65 @@ class Movie:
 
     @staticmethod
     def to_dict(dict: Any) -> "Movie":
-        for key, value in dict.items():
-            if key == "PK":
-                year = int(value.split("|")[1])
-            elif key == "SK":
-                title = value
-            elif key == "info":
-                for k, v in value.items():
-                    if k == "plot":
-                        plot = v
-                    elif k == "rating":
-                        rating = v
-        movie_info = MovieInfo(plot=plot, rating=rating)
-        movie = Movie(year, title, movie_info)
+        info = dict["info"]
+        movie_info = MovieInfo(plot=info["plot"], rating=info["rating"])
+        movie = Movie(int(dict["PK"].split("|", 1)[1]), dict["SK"], movie_info)
+        return movie
+
+    @staticmethod
+    def to_fields(item: Any, fields: tuple[str, ...]) -> dict:
+        """指定した項目のみを持つ Movie と同じ形の dict に変換する"""
+        movie = {}
+        if "year" in fields:
+            movie["year"] = int(item["PK"].split("|")[1])
+        if "title" in fields:
+            movie["title"] = item["SK"]
+        info = item.get("info", {})
+        if "plot" in fields or "rating" in fields:
+            movie["info"] = {}
+            if "plot" in fields:
+                movie["info"]["plot"] = info.get("plot")
+            if "rating" in fields:
+                rating = info.get("rating")
+                movie["info"]["rating"] = None if rating is None else float(rating)
         return movie
     
     @staticmethod
-    def to_db(form: MovieForm):
+    def list_partition(year: int, title: str, shards: int = 1) -> str:
+        """GSIndex1 のパーティションキーを返す
+
+        shards が 1 の場合は従来どおり全件 "Movie"、
+        2 以上の場合は年・タイトルのハッシュで "Movie#0".."Movie#{shards-1}" に分散する。
+        """
+        if shards <= 1:
+            return "Movie"
+        return f"Movie#{zlib.crc32(f'{year}|{title}'.encode('utf-8')) % shards}"
+
+    @staticmethod
+    def list_partitions(shards: int = 1) -> list[str]:
+        """GSIndex1 の全パーティションキーを返す"""
+        if shards <= 1:
+            return ["Movie"]
+        return [f"Movie#{shard}" for shard in range(shards)]
+
+    @staticmethod
+    def rating_key(rating: float, title: str) -> str:
+        """評価順インデックスのソートキー（0.00〜5.00 を 3 桁にゼロ埋め）を返す"""
+        return f"{round(float(rating) * 100):03d}#{title}"
+
+    @staticmethod
+    def to_db(form: MovieForm, shards: int = 1):
+        rating_key = Movie.rating_key(form.rating, form.title)
         return {
             "PK": f"Movie|{form.year}",
             "SK": form.title,
-            "GSI1PK": "Movie",
-            "GSI1SK": "-",
+            "GSI1PK": Movie.list_partition(form.year, form.title, shards),
+            "GSI1SK": rating_key,
+            "GSI2PK": f"Movie|{form.year}",
+            "GSI2SK": rating_key,
             "info": {
                 "plot": form.plot,
-                "rating": Decimal(form.rating),
+                "rating": Decimal(str(form.rating)),
             },
         }
 
@@ -68,4 +147,36 @@ class Movie:
         return value
     
     # def __post_init__(self):
-    #     print(f'Second: {self.info}')
\ No newline at end of file
+    #     print(f'Second: {self.info}')
+
+@dataclass
+class MoviePage:
+    items: list[Movie | dict[str, Any]]
+    next_cursor: str | None = None
+
+@dataclass
+class MovieBulkError:
+    index: int
+    reason: str
+    year: int | None = None
+    title: str | None = None
+
+@dataclass
+class MovieBulkResult:
+    total: int
+    succeeded: int
+    failed: int
+    errors: list[MovieBulkError]
+
+@dataclass
+class MovieSearchHit:
+    year: int
+    title: str
+    info: MovieInfo
+    score: float
+
+@dataclass
+class MovieSearchPage:
+    items: list[MovieSearchHit]
+    total: int
+    next_cursor: str | None = None
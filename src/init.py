@@ -1,5 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from core.config import env_vars
+from core.dependencies import injector
+from repository.async_movie_repo import async_movie_table
+from usecase.movie.build_movie_indexes import BuildMovieIndexesUsecase
+from usecase.movie.setup_movie_table import SetupMovieTableUsecase
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # テーブルの存在確認・作成は起動時に一度だけ行う
+    injector.get(SetupMovieTableUsecase).execute()
+    if env_vars.MOVIE_SEARCH_ENABLED:
+        injector.get(BuildMovieIndexesUsecase).execute(env_vars.EXPORT_SCAN_SEGMENTS, env_vars.EXPORT_PAGE_SIZE)
+    yield
+    await async_movie_table.close()
+
+
 app = FastAPI(
     title="ManagePhoto",
     description="FastAPI Cognito API authentication service",
@@ -9,5 +28,6 @@ app = FastAPI(
             "url": "http://localhost:8000",
             "description": "Local server"
         }
-    ]
+    ],
+    lifespan=lifespan,
 )
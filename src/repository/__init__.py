@@ -1 +1,8 @@
-from .movie_repo import MovieRepo
\ No newline at end of file
+from .movie_repo import MovieRepo
+from .fast_movie_repo import FastMovieRepo
+from .in_memory_movie_repo import InMemoryMovieRepo
+from .async_movie_repo import AsyncMovieRepo
+from .cached_movie_repo import CacheInvalidatingAsyncMovieRepo, CachedMovieRepo
+from .indexed_movie_repo import IndexedAsyncMovieRepo, IndexedMovieRepo
+from .movie_search_index import MovieSearchIndex
+from .movie_title_index import MovieTitleIndex
\ No newline at end of file
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import aioboto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from decimal import Decimal
+
+from core.config import env_vars
+from core.dynamodb import AsyncTableHandle, decode_cursor, dynamodb_config, encode_cursor
+from domain.entity.movie import Movie, MovieForm
+from repository.movie_aggregates import aggregate_delta, aggregate_update
+from repository.movie_projection import movie_projection
+from repository.movie_shards import decode_shard_cursor, encode_shard_cursor, split_limit
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+
+LOGGER = logging.getLogger(__name__)
+
+# プロセス内で共有する非同期テーブルハンドル
+async_movie_table = AsyncTableHandle(
+    lambda: aioboto3.Session().resource(
+        "dynamodb",
+        endpoint_url=env_vars.DYNAMODB_ENDPOINT_URL,
+        config=dynamodb_config(),
+    ),
+    env_vars.DYNAMODB_TABLE_NAME,
+)
+
+class AsyncMovieRepo(IAsyncMovieRepo):
+
+    def __init__(
+        self,
+        table_handle: AsyncTableHandle = async_movie_table,
+        list_shards: int = env_vars.MOVIE_LIST_SHARDS,
+        aggregates_enabled: bool = env_vars.MOVIE_AGGREGATES_ENABLED,
+    ):
+        self.__table_handle = table_handle
+        self.__table_name = table_handle.name
+        self.__list_shards = list_shards
+        self.__aggregates_enabled = aggregates_enabled
+
+    async def add_movie(self, data: MovieForm):
+        item = Movie.to_db(data, self.__list_shards)
+        table = await self.__table_handle.get()
+        try:
+            response = await table.put_item(Item=item, ReturnValues="ALL_OLD")
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't add movie %s to table %s. Here's why: %s: %s",
+                data.title,
+                self.__table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        else:
+            await self.__add_aggregate(data.year, response.get("Attributes"), data.rating)
+
+    async def get_movie(self, year, title):
+        table = await self.__table_handle.get()
+        try:
+            response = await table.get_item(Key={"PK": f"Movie|{str(year)}", "SK": title}, **movie_projection())
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't get movie %s from table %s. Here's why: %s: %s",
+                title,
+                self.__table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        else:
+            if not "Item" in response:
+                return None
+
+            return response["Item"]
+
+    async def update_movie(self, data: MovieForm):
+        table = await self.__table_handle.get()
+        try:
+            response = await table.update_item(
+                Key={"PK": f"Movie|{str(data.year)}", "SK": data.title},
+                UpdateExpression="set info.rating=:r, info.plot=:p, GSI1PK=:p1, GSI1SK=:s, GSI2PK=:p2, GSI2SK=:s",
+                ExpressionAttributeValues={
+                    ":r": Decimal(str(data.rating)),
+                    ":p": data.plot,
+                    ":p1": Movie.list_partition(data.year, data.title, self.__list_shards),
+                    ":p2": f"Movie|{data.year}",
+                    ":s": Movie.rating_key(data.rating, data.title),
+                },
+                ReturnValues="ALL_OLD",
+            )
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't update movie %s in table %s. Here's why: %s: %s",
+                data.title,
+                self.__table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        else:
+            await self.__add_aggregate(data.year, response["Attributes"], data.rating)
+            # インデックス用の属性は返さない
+            return {"info": {"rating": Decimal(str(data.rating)), "plot": data.plot}}
+
+    async def query_movies(self, year, limit=None, cursor=None, fields=None):
+        try:
+            key_condition = Key("PK").eq(f"Movie|{str(year)}")
+            kwargs = {"KeyConditionExpression": key_condition, **movie_projection(fields)}
+            return await self._query_page(kwargs, limit, cursor)
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't query for movies released in %s. Here's why: %s: %s",
+                year,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    async def list_movie(self, limit=None, cursor=None, fields=None):
+        if self.__list_shards <= 1:
+            return await self.__list_partition("Movie", limit, cursor, fields)
+
+        # 全パーティションを並列に読み、結果を連結する
+        shard_cursors = decode_shard_cursor(cursor, self.__list_shards)
+        shard_limit = split_limit(limit, len(shard_cursors))
+        partitions = Movie.list_partitions(self.__list_shards)
+        shards = list(shard_cursors)
+        pages = await asyncio.gather(*(
+            self.__list_partition(partitions[shard], shard_limit, shard_cursors[shard], fields)
+            for shard in shards
+        ))
+        items = []
+        next_cursors = {}
+        for shard, (shard_items, next_cursor) in zip(shards, pages):
+            items.extend(shard_items)
+            next_cursors[shard] = next_cursor
+        return items, encode_shard_cursor(next_cursors)
+
+    async def __list_partition(self, partition, limit=None, cursor=None, fields=None):
+        try:
+            key_condition = Key("GSI1PK").eq(partition)
+            kwargs = {
+                "IndexName": "GSIndex1",
+                "KeyConditionExpression": key_condition,
+                **movie_projection(fields),
+            }
+            return await self._query_page(kwargs, limit, cursor)
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't query for movie list in %s. Here's why: %s: %s",
+                partition,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    async def _query_page(self, kwargs, limit=None, cursor=None):
+        """Query を 1 ページ分実行し、(Items, 次ページのカーソル) を返す"""
+        if limit is not None:
+            kwargs["Limit"] = limit
+        exclusive_start_key = decode_cursor(cursor)
+        if exclusive_start_key is not None:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
+        table = await self.__table_handle.get()
+        response = await table.query(**kwargs)
+        return response["Items"], encode_cursor(response.get("LastEvaluatedKey"))
+
+    async def delete_movie(self, title, year):
+        table = await self.__table_handle.get()
+        try:
+            response = await table.delete_item(
+                Key={"PK": f"Movie|{str(year)}", "SK": title},
+                ReturnValues="ALL_OLD",
+            )
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't delete movie %s. Here's why: %s: %s",
+                title,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+        else:
+            await self.__add_aggregate(year, response.get("Attributes"))
+
+    async def __add_aggregate(self, year, old_item, new_rating=None):
+        """書き込み前後の差分を公開年の集計に反映する"""
+        if not self.__aggregates_enabled:
+            return
+        count, rating_sum = aggregate_delta(old_item, new_rating)
+        if count == 0 and rating_sum == 0:
+            return
+        table = await self.__table_handle.get()
+        try:
+            await table.update_item(**aggregate_update(year, count, rating_sum))
+        except ClientError as err:
+            # 映画の書き込みは完了しているため失敗させず、集計のずれはログに残す
+            LOGGER.error(
+                "Couldn't update movie aggregate for %s (count %+d, rating sum %s). Here's why: %s: %s",
+                year,
+                count,
+                rating_sum,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
@@ -0,0 +1,181 @@
+import threading
+from logging import getLogger
+
+from core.ttl_cache import MISSING, TTLCache
+from domain.entity.movie import MovieForm
+from repository.delegating_movie_repo import DelegatingMovieRepo
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+
+class CachedMovieRepo(DelegatingMovieRepo):
+    """get_movie / query_movies / list_movie の結果をキャッシュする読み込みスルーキャッシュ
+
+    書き込み系の操作では該当する映画・年・一覧のキャッシュを破棄する。
+    キャッシュはプロセス単位のため、他プロセスからの更新は TTL 経過後に反映される。
+
+    読み込み中に破棄が起きた場合に書き込み前の値を保存しないよう、公開年・一覧ごとの世代を
+    読み込みの前に控えておき、保存する時点で世代が変わっていれば保存しない。
+    """
+
+    def __init__(self, inner: IMovieRepo, maxsize: int, ttl: float, negative_ttl: float):
+        super().__init__(inner)
+        self.__details = TTLCache(maxsize, ttl, negative_ttl)
+        self.__queries = TTLCache(maxsize, ttl)
+        self.__lists = TTLCache(maxsize, ttl)
+        self.__generation_lock = threading.Lock()
+        # 公開年 -> 破棄した回数、一覧の破棄した回数
+        self.__year_generations: dict[str, int] = {}
+        self.__list_generation = 0
+
+    def stats(self) -> dict:
+        return {
+            "detail": self.__details.stats(),
+            "query": self.__queries.stats(),
+            "list": self.__lists.stats(),
+        }
+
+    def get_movie(self, year, title):
+        key = (str(year), title)
+        item = self.__details.get(key)
+        if item is MISSING:
+            generation = self.__year_generations.get(str(year), 0)
+            item = self._inner.get_movie(year, title)
+            self.__fill_year(self.__details, key, item, str(year), generation)
+        return item
+
+    def batch_get_movies(self, keys):
+        items = [self.__details.get((str(year), title)) for year, title in keys]
+        missing_keys = [key for key, item in zip(keys, items) if item is MISSING]
+        if missing_keys:
+            generations = {str(year): self.__year_generations.get(str(year), 0) for year, _ in missing_keys}
+            fetched = dict(zip(
+                [(str(year), title) for year, title in missing_keys],
+                self._inner.batch_get_movies(missing_keys),
+            ))
+            for key, item in fetched.items():
+                self.__fill_year(self.__details, key, item, key[0], generations[key[0]])
+            items = [
+                fetched[(str(year), title)] if item is MISSING else item
+                for (year, title), item in zip(keys, items)
+            ]
+        return items
+
+    def query_movies(self, year, limit=None, cursor=None, fields=None):
+        key = (str(year), limit, cursor, fields)
+        page = self.__queries.get(key)
+        if page is MISSING:
+            generation = self.__year_generations.get(str(year), 0)
+            page = self._inner.query_movies(year, limit, cursor, fields)
+            self.__fill_year(self.__queries, key, page, str(year), generation)
+        return page
+
+    def list_movie(self, limit=None, cursor=None, fields=None):
+        key = (limit, cursor, fields)
+        page = self.__lists.get(key)
+        if page is MISSING:
+            generation = self.__list_generation
+            page = self._inner.list_movie(limit, cursor, fields)
+            with self.__generation_lock:
+                if self.__list_generation == generation:
+                    self.__lists.set(key, page)
+        return page
+
+    def add_movie(self, data: MovieForm):
+        try:
+            return self._inner.add_movie(data)
+        finally:
+            self.invalidate(data.year, data.title)
+
+    def batch_add_movies(self, data: list[MovieForm]):
+        try:
+            return self._inner.batch_add_movies(data)
+        finally:
+            self.invalidate_many([(form.year, form.title) for form in data])
+
+    def update_movie(self, data: MovieForm):
+        try:
+            return self._inner.update_movie(data)
+        finally:
+            self.invalidate(data.year, data.title)
+
+    def delete_movie(self, title, year):
+        try:
+            return self._inner.delete_movie(title, year)
+        finally:
+            self.invalidate(year, title)
+
+    def batch_delete_movies(self, keys):
+        try:
+            return self._inner.batch_delete_movies(keys)
+        finally:
+            self.invalidate_many(keys)
+
+    def transact_write_movies(self, operations):
+        try:
+            return self._inner.transact_write_movies(operations)
+        finally:
+            self.invalidate_many([(operation.year, operation.title) for operation in operations])
+
+    def invalidate(self, year, title) -> None:
+        """映画 1 件の更新に伴い、影響するキャッシュを破棄する"""
+        self.invalidate_many([(year, title)])
+
+    def invalidate_many(self, keys) -> None:
+        """(year, title) のリストに対応するキャッシュをまとめて破棄する"""
+        years = {str(year) for year, _ in keys}
+        with self.__generation_lock:
+            for year in years:
+                self.__year_generations[year] = self.__year_generations.get(year, 0) + 1
+            self.__list_generation += 1
+            for year, title in keys:
+                self.__details.pop((str(year), title))
+            self.__queries.remove_if(lambda key: key[0] in years)
+            self.__lists.clear()
+
+    def __fill_year(self, cache: TTLCache, key, value, year: str, generation: int) -> None:
+        """読み込み前に控えた公開年の世代が変わっていない場合のみキャッシュに保存する"""
+        with self.__generation_lock:
+            if self.__year_generations.get(year, 0) == generation:
+                cache.set(key, value)
+
+
+class CacheInvalidatingAsyncMovieRepo(IAsyncMovieRepo):
+    """非同期リポジトリでの書き込み時に、同期リポジトリの CachedMovieRepo のキャッシュを破棄する
+
+    読み込みはキャッシュしない（非同期リポジトリを使うエンドポイントは常に DynamoDB から読む）。
+    """
+
+    def __init__(self, inner: IAsyncMovieRepo, cache: CachedMovieRepo):
+        self._inner = inner
+        self.__cache = cache
+
+    async def add_movie(self, data: MovieForm):
+        try:
+            return await self._inner.add_movie(data)
+        finally:
+            self.__cache.invalidate(data.year, data.title)
+
+    async def get_movie(self, year, title):
+        return await self._inner.get_movie(year, title)
+
+    async def update_movie(self, data: MovieForm):
+        try:
+            return await self._inner.update_movie(data)
+        finally:
+            self.__cache.invalidate(data.year, data.title)
+
+    async def query_movies(self, year, limit=None, cursor=None, fields=None):
+        return await self._inner.query_movies(year, limit, cursor, fields)
+
+    async def list_movie(self, limit=None, cursor=None, fields=None):
+        return await self._inner.list_movie(limit, cursor, fields)
+
+    async def delete_movie(self, title, year):
+        try:
+            return await self._inner.delete_movie(title, year)
+        finally:
+            self.__cache.invalidate(year, title)
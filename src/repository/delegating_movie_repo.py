@@ -0,0 +1,73 @@
+from domain.entity.movie import MovieForm
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+class DelegatingMovieRepo(IMovieRepo):
+    """別の IMovieRepo に処理を委譲するラッパーの基底クラス
+
+    キャッシュなど、一部の操作にだけ処理を追加したいラッパーは
+    このクラスを継承して必要なメソッドのみ上書きする。
+    """
+
+    def __init__(self, inner: IMovieRepo):
+        self._inner = inner
+
+    def exists(self):
+        return self._inner.exists()
+
+    def create_table(self):
+        return self._inner.create_table()
+
+    def list_tables(self):
+        return self._inner.list_tables()
+
+    def add_movie(self, data: MovieForm):
+        return self._inner.add_movie(data)
+
+    def batch_add_movies(self, data: list[MovieForm]):
+        return self._inner.batch_add_movies(data)
+
+    def get_movie(self, year, title):
+        return self._inner.get_movie(year, title)
+
+    def batch_get_movies(self, keys):
+        return self._inner.batch_get_movies(keys)
+
+    def update_movie(self, data: MovieForm):
+        return self._inner.update_movie(data)
+
+    def query_movies(self, year, limit=None, cursor=None, fields=None):
+        return self._inner.query_movies(year, limit, cursor, fields)
+
+    def list_movie(self, limit=None, cursor=None, fields=None):
+        return self._inner.list_movie(limit, cursor, fields)
+
+    def top_movies(self, limit, year=None, fields=None):
+        return self._inner.top_movies(limit, year, fields)
+
+    def has_unmigrated_index_items(self):
+        return self._inner.has_unmigrated_index_items()
+
+    def complete_titles(self, year, prefix, limit):
+        return self._inner.complete_titles(year, prefix, limit)
+
+    def count_movies(self, year=None):
+        return self._inner.count_movies(year)
+
+    def aggregate_movies(self, year=None):
+        return self._inner.aggregate_movies(year)
+
+    def put_movie_aggregates(self, aggregates):
+        return self._inner.put_movie_aggregates(aggregates)
+
+    def scan_movies(self, segment, total_segments, limit=None, cursor=None):
+        return self._inner.scan_movies(segment, total_segments, limit, cursor)
+
+    def batch_delete_movies(self, keys):
+        return self._inner.batch_delete_movies(keys)
+
+    def transact_write_movies(self, operations):
+        return self._inner.transact_write_movies(operations)
+
+    def delete_movie(self, title, year):
+        return self._inner.delete_movie(title, year)
@@ -0,0 +1,151 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+from botocore.exceptions import ClientError
+
+
+LOGGER = getLogger(__name__)
+
+# BatchWriteItem の 1 リクエストあたりの上限件数
+BATCH_WRITE_LIMIT = 25
+
+
+def _request_key(request: dict) -> tuple:
+    if "PutRequest" in request:
+        item = request["PutRequest"]["Item"]
+    else:
+        item = request["DeleteRequest"]["Key"]
+    return item["PK"], item["SK"]
+
+
+def _backoff(attempt: int, base_delay: float) -> None:
+    # フルジッター付きの指数バックオフ
+    time.sleep(random.uniform(0, base_delay * (2 ** attempt)))
+
+
+def _write_chunk(client, table_name, chunk, max_attempts, base_delay):
+    """25 件以下の書き込みを UnprocessedItems がなくなるまで再送する
+
+    Returns:
+        dict: キーごとの失敗理由（成功したキーは含まない）
+    """
+    pending = [request for _, request in chunk]
+    for attempt in range(max_attempts):
+        if attempt > 0:
+            _backoff(attempt, base_delay)
+        try:
+            response = client.batch_write_item(RequestItems={table_name: pending})
+        except ClientError as err:
+            code = err.response["Error"]["Code"]
+            if code in ("ProvisionedThroughputExceededException", "ThrottlingException"):
+                continue
+            LOGGER.error(
+                "Couldn't write batch to table %s. Here's why: %s: %s",
+                table_name,
+                code,
+                err.response["Error"]["Message"],
+            )
+            return {_request_key(request): code for request in pending}
+        pending = response.get("UnprocessedItems", {}).get(table_name, [])
+        if not pending:
+            return {}
+    return {_request_key(request): "UnprocessedItems retry limit exceeded" for request in pending}
+
+
+def batch_write(client, table_name, requests, max_workers=4, max_attempts=5, base_delay=0.05):
+    """BatchWriteItem を 25 件ずつ並列に実行する
+
+    同一リクエスト内でキーが重複すると DynamoDB がエラーを返すため、
+    呼び出し側で重複を取り除いておくこと。
+
+    Args:
+        client: DynamoDB クライアント
+        table_name (str): テーブル名
+        requests (list[dict]): PutRequest / DeleteRequest のリスト
+        max_workers (int): 同時に実行するチャンク数
+        max_attempts (int): UnprocessedItems を含めた最大試行回数
+        base_delay (float): バックオフの基準秒数
+
+    Returns:
+        list[str | None]: requests と同じ順序の失敗理由（成功時は None）
+    """
+    indexed = list(enumerate(requests))
+    chunks = [
+        indexed[start:start + BATCH_WRITE_LIMIT]
+        for start in range(0, len(indexed), BATCH_WRITE_LIMIT)
+    ]
+    results = [None] * len(requests)
+    if not chunks:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [
+            (chunk, executor.submit(_write_chunk, client, table_name, chunk, max_attempts, base_delay))
+            for chunk in chunks
+        ]
+        for chunk, future in futures:
+            failures = future.result()
+            for index, request in chunk:
+                results[index] = failures.get(_request_key(request))
+    return results
+
+
+# BatchGetItem の 1 リクエストあたりの上限件数
+BATCH_GET_LIMIT = 100
+
+
+def _get_chunk(client, table_name, keys, max_attempts, base_delay):
+    """100 件以下のキーを UnprocessedKeys がなくなるまで再取得する"""
+    items = {}
+    request = {"Keys": keys}
+    for attempt in range(max_attempts):
+        if attempt > 0:
+            _backoff(attempt, base_delay)
+        try:
+            response = client.batch_get_item(RequestItems={table_name: request})
+        except ClientError as err:
+            code = err.response["Error"]["Code"]
+            if code in ("ProvisionedThroughputExceededException", "ThrottlingException"):
+                continue
+            LOGGER.error(
+                "Couldn't get batch from table %s. Here's why: %s: %s",
+                table_name,
+                code,
+                err.response["Error"]["Message"],
+            )
+            raise
+        for item in response.get("Responses", {}).get(table_name, []):
+            items[(item["PK"], item["SK"])] = item
+        request = response.get("UnprocessedKeys", {}).get(table_name)
+        if not request or not request.get("Keys"):
+            return items
+    raise RuntimeError(f"UnprocessedKeys retry limit exceeded for table {table_name}")
+
+
+def batch_get(client, table_name, keys, max_workers=4, max_attempts=5, base_delay=0.05):
+    """BatchGetItem を 100 件ずつ並列に実行する
+
+    Args:
+        client: DynamoDB クライアント
+        table_name (str): テーブル名
+        keys (list[dict]): 重複のない {"PK": ..., "SK": ...} のリスト
+        max_workers (int): 同時に実行するチャンク数
+        max_attempts (int): UnprocessedKeys を含めた最大試行回数
+        base_delay (float): バックオフの基準秒数
+
+    Returns:
+        dict: (PK, SK) をキーとした取得結果（存在しないキーは含まない）
+    """
+    chunks = [keys[start:start + BATCH_GET_LIMIT] for start in range(0, len(keys), BATCH_GET_LIMIT)]
+    items = {}
+    if not chunks:
+        return items
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [
+            executor.submit(_get_chunk, client, table_name, chunk, max_attempts, base_delay)
+            for chunk in chunks
+        ]
+        for future in futures:
+            items.update(future.result())
+    return items
@@ -0,0 +1,86 @@
+import logging
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+from botocore.exceptions import ClientError
+
+from core.config import env_vars
+from core.dynamodb import TableHandle, decode_cursor, encode_cursor, get_dynamodb_client
+from repository.movie_decoder import decode_key, decode_movie_item, encode_key
+from repository.movie_projection import movie_projection
+from repository.movie_repo import MovieRepo, movie_table
+
+LOGGER = logging.getLogger(__name__)
+
+# リソース層の Query 引数のうち、そのまま低レベルクライアントに渡せるもの
+_PASS_THROUGH_ARGS = ("IndexName", "ProjectionExpression", "ScanIndexForward", "Select")
+
+
+class FastMovieRepo(MovieRepo):
+    """読み込みに低レベルクライアントと専用デコーダを使う MovieRepo
+
+    boto3 リソースの TypeDeserializer による全属性の変換と Decimal の生成を省き、
+    映画アイテムの固定の形から直接 Movie.to_dict が受け取れる dict を作る。
+    書き込み系の操作は MovieRepo と同じリソース層を使う。
+    """
+
+    def __init__(
+        self,
+        table_handle: TableHandle = movie_table,
+        list_shards: int = env_vars.MOVIE_LIST_SHARDS,
+        aggregates_enabled: bool = env_vars.MOVIE_AGGREGATES_ENABLED,
+        client=None,
+    ):
+        super().__init__(table_handle, list_shards, aggregates_enabled)
+        self.__table_handle = table_handle
+        self.__table_name = table_handle.name
+        self.__client = client if client is not None else get_dynamodb_client()
+
+    def get_movie(self, year, title):
+        try:
+            response = self.__client.get_item(
+                TableName=self.__table_name,
+                Key=encode_key({"PK": f"Movie|{str(year)}", "SK": title}),
+                **movie_projection(),
+            )
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't get movie %s from table %s. Here's why: %s: %s",
+                title,
+                self.__table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            # 存在しない映画 (None) と区別できるよう、エラーは呼び出し元に返す
+            raise
+        else:
+            if not "Item" in response:
+                return None
+
+            return decode_movie_item(response["Item"])
+
+    def _query_page(self, kwargs, limit=None, cursor=None):
+        """Query を低レベルクライアントで 1 ページ分実行し、(Items, 次ページのカーソル) を返す"""
+        built = ConditionExpressionBuilder().build_expression(kwargs["KeyConditionExpression"], is_key_condition=True)
+        request = {
+            "TableName": self.__table_name,
+            "KeyConditionExpression": built.condition_expression,
+            "ExpressionAttributeNames": {
+                **kwargs.get("ExpressionAttributeNames", {}),
+                **built.attribute_name_placeholders,
+            },
+            # キー条件の値はすべて文字列
+            "ExpressionAttributeValues": {
+                name: {"S": value} for name, value in built.attribute_value_placeholders.items()
+            },
+        }
+        for name in _PASS_THROUGH_ARGS:
+            if name in kwargs:
+                request[name] = kwargs[name]
+        if limit is not None:
+            request["Limit"] = limit
+        exclusive_start_key = decode_cursor(cursor)
+        if exclusive_start_key is not None:
+            request["ExclusiveStartKey"] = encode_key(exclusive_start_key)
+        response = self.__client.query(**request)
+        items = [decode_movie_item(item) for item in response["Items"]]
+        return items, encode_cursor(decode_key(response.get("LastEvaluatedKey")))
@@ -0,0 +1,302 @@
+import copy
+import logging
+import threading
+import zlib
+from bisect import bisect_left, bisect_right, insort
+from botocore.exceptions import ClientError
+from decimal import Decimal
+
+from core.config import env_vars
+from core.dynamodb import decode_cursor, encode_cursor
+from domain.entity.movie import Movie, MovieForm
+from repository.movie_aggregates import aggregate_delta
+from repository.movie_shards import decode_shard_cursor, encode_shard_cursor, split_limit
+from usecase.interface.i_movie_repo import IMovieRepo
+
+LOGGER = logging.getLogger(__name__)
+
+# インデックス名（None はテーブル本体）と、そのパーティションキー・ソートキーの属性
+_INDEXES = {
+    None: ("PK", "SK"),
+    "GSIndex1": ("GSI1PK", "GSI1SK"),
+    "GSIndex2": ("GSI2PK", "GSI2SK"),
+}
+
+
+class InMemoryMovieRepo(IMovieRepo):
+    """DynamoDB を使わずプロセス内の dict とソート済みインデックスで動く IMovieRepo
+
+    負荷試験やベンチマークで、ネットワークを除いたコントローラ・ユースケース・シリアライズの
+    コストを測るためのもの。キーの並び順（パーティション内はソートキーの昇順、GSI の同じ
+    ソートキー内はテーブルのキー順）・Limit・LastEvaluatedKey によるページ分割は
+    DynamoDB と同じ形で返す。1 MB ごとのページ分割と消費キャパシティは再現しない。
+    """
+
+    def __init__(self, table_name: str = env_vars.DYNAMODB_TABLE_NAME, list_shards: int = env_vars.MOVIE_LIST_SHARDS):
+        self.__table_name = table_name
+        self.__list_shards = list_shards
+        self.__lock = threading.RLock()
+        self.__created = False
+        self.__items = {}
+        # インデックス名 -> パーティション -> (ソートキー, PK, SK) のソート済みリスト
+        self.__indexes = {index: {} for index in _INDEXES}
+        # 公開年 -> (件数, 評価の合計)
+        self.__aggregates = {}
+
+    def exists(self):
+        return self.__created
+
+    def create_table(self):
+        self.__created = True
+
+    def list_tables(self):
+        return [self.__table_name]
+
+    def add_movie(self, data: MovieForm):
+        with self.__lock:
+            self.__put(Movie.to_db(data, self.__list_shards))
+
+    def batch_add_movies(self, data: list[MovieForm]):
+        with self.__lock:
+            for form in data:
+                self.__put(Movie.to_db(form, self.__list_shards))
+        return [None] * len(data)
+
+    def get_movie(self, year, title):
+        with self.__lock:
+            item = self.__items.get((f"Movie|{str(year)}", title))
+            return None if item is None else self.__project(item)
+
+    def batch_get_movies(self, keys):
+        with self.__lock:
+            items = [self.__items.get((f"Movie|{str(year)}", title)) for year, title in keys]
+            return [None if item is None else self.__project(item) for item in items]
+
+    def update_movie(self, data: MovieForm):
+        with self.__lock:
+            if (f"Movie|{str(data.year)}", data.title) not in self.__items:
+                # 存在しない映画の info.rating などを更新した場合の DynamoDB のエラーに合わせる
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "ValidationException",
+                            "Message": "The document path provided in the update expression is invalid for update",
+                        }
+                    },
+                    "UpdateItem",
+                )
+            item = self.__put(Movie.to_db(data, self.__list_shards))
+            return {"info": copy.deepcopy(item["info"])}
+
+    def query_movies(self, year, limit=None, cursor=None, fields=None):
+        return self.__query(None, f"Movie|{str(year)}", limit, cursor, fields)
+
+    def list_movie(self, limit=None, cursor=None, fields=None):
+        if self.__list_shards <= 1:
+            return self.__query("GSIndex1", "Movie", limit, cursor, fields)
+
+        shard_cursors = decode_shard_cursor(cursor, self.__list_shards)
+        shard_limit = split_limit(limit, len(shard_cursors))
+        partitions = Movie.list_partitions(self.__list_shards)
+        items = []
+        next_cursors = {}
+        for shard, shard_cursor in shard_cursors.items():
+            shard_items, next_cursors[shard] = self.__query("GSIndex1", partitions[shard], shard_limit, shard_cursor, fields)
+            items.extend(shard_items)
+        return items, encode_shard_cursor(next_cursors)
+
+    def top_movies(self, limit, year=None, fields=None):
+        if year is not None:
+            items, _ = self.__query("GSIndex2", f"Movie|{str(year)}", limit, fields=fields, forward=False)
+            return items
+
+        items = []
+        for partition in Movie.list_partitions(self.__list_shards):
+            page, _ = self.__query("GSIndex1", partition, limit, fields=fields, forward=False, extra_attributes=("GSI1SK",))
+            items.extend(page)
+        items.sort(key=lambda item: item["GSI1SK"], reverse=True)
+        return items[:limit]
+
+    def has_unmigrated_index_items(self):
+        # Movie.to_db でしか書き込まないため、古い形式の映画はない
+        return False
+
+    def complete_titles(self, year, prefix, limit):
+        with self.__lock:
+            partition = f"Movie|{str(year)}"
+            entries = self.__indexes[None].get(partition, [])
+            position = bisect_left(entries, (prefix,))
+            items = []
+            for sort_value, pk, sk in entries[position:position + limit]:
+                if not sort_value.startswith(prefix):
+                    break
+                items.append(self.__project(self.__items[(pk, sk)], ("year", "title")))
+            return items
+
+    def count_movies(self, year=None):
+        with self.__lock:
+            if year is not None:
+                return len(self.__indexes[None].get(f"Movie|{str(year)}", []))
+            return sum(len(self.__indexes["GSIndex1"].get(partition, [])) for partition in Movie.list_partitions(self.__list_shards))
+
+    def aggregate_movies(self, year=None):
+        with self.__lock:
+            years = [str(year)] if year is not None else sorted(self.__aggregates)
+            items = []
+            for key in years:
+                if key not in self.__aggregates:
+                    continue
+                count, rating_sum = self.__aggregates[key]
+                items.append({"year": key, "count": count, "rating_sum": rating_sum})
+            return items
+
+    def put_movie_aggregates(self, aggregates):
+        with self.__lock:
+            for year, (count, rating_sum) in aggregates.items():
+                self.__aggregates[str(year)] = (count, Decimal(str(rating_sum)))
+        return [None] * len(aggregates)
+
+    def scan_movies(self, segment, total_segments, limit=None, cursor=None):
+        with self.__lock:
+            # セグメントはパーティションキーのハッシュで分け、セグメント内はキー順に返す
+            keys = sorted(
+                key for key in self.__items
+                if zlib.crc32(key[0].encode("utf-8")) % total_segments == segment
+            )
+            start = decode_cursor(cursor)
+            try:
+                position = 0 if start is None else bisect_right(keys, (start["PK"], start["SK"]))
+            except KeyError as err:
+                raise ValueError("Invalid cursor") from err
+            end = len(keys) if limit is None else position + limit
+            page = keys[position:end]
+            items = [copy.deepcopy(self.__items[key]) for key in page]
+            next_cursor = None
+            if limit is not None and len(page) == limit:
+                next_cursor = encode_cursor({"PK": page[-1][0], "SK": page[-1][1]})
+            return items, next_cursor, 0
+
+    def delete_movie(self, title, year):
+        with self.__lock:
+            old_item = self.__items.pop((f"Movie|{str(year)}", title), None)
+            if old_item is not None:
+                self.__unindex(old_item)
+                self.__add_aggregate(str(year), old_item)
+
+    def batch_delete_movies(self, keys):
+        with self.__lock:
+            for year, title in keys:
+                self.delete_movie(title, year)
+        return [None] * len(keys)
+
+    def transact_write_movies(self, operations):
+        with self.__lock:
+            # DynamoDB と同様に、条件を満たさない操作が 1 件でもあれば何も書き込まない
+            reasons = [
+                "ConditionalCheckFailed"
+                if operation.action == "update" and (f"Movie|{operation.year}", operation.title) not in self.__items
+                else "None"
+                for operation in operations
+            ]
+            if any(reason != "None" for reason in reasons):
+                raise ClientError(
+                    {
+                        "Error": {
+                            "Code": "TransactionCanceledException",
+                            "Message": f"Transaction cancelled, please refer cancellation reasons for specific reasons [{', '.join(reasons)}]",
+                        },
+                        "CancellationReasons": [{"Code": reason} for reason in reasons],
+                    },
+                    "TransactWriteItems",
+                )
+            for operation in operations:
+                if operation.action == "delete":
+                    self.delete_movie(operation.title, operation.year)
+                else:
+                    self.__put(Movie.to_db(operation.to_form(), self.__list_shards))
+
+    def clear(self):
+        """全ての映画と集計を削除する（ベンチマークの実行ごとの初期化用）"""
+        with self.__lock:
+            self.__items.clear()
+            self.__indexes = {index: {} for index in _INDEXES}
+            self.__aggregates.clear()
+
+    def __put(self, item):
+        key = (item["PK"], item["SK"])
+        old_item = self.__items.get(key)
+        if old_item is not None:
+            self.__unindex(old_item)
+        self.__items[key] = item
+        for index, (partition_key, sort_key) in _INDEXES.items():
+            entries = self.__indexes[index].setdefault(item[partition_key], [])
+            insort(entries, (item[sort_key], item["PK"], item["SK"]))
+        self.__add_aggregate(item["PK"].split("|", 1)[1], old_item, item["info"]["rating"])
+        return item
+
+    def __unindex(self, item):
+        for index, (partition_key, sort_key) in _INDEXES.items():
+            partition = item.get(partition_key)
+            entries = self.__indexes[index].get(partition)
+            if not entries:
+                continue
+            entry = (item[sort_key], item["PK"], item["SK"])
+            position = bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+            if not entries:
+                del self.__indexes[index][partition]
+
+    def __add_aggregate(self, year, old_item, new_rating=None):
+        count, rating_sum = aggregate_delta(old_item, new_rating)
+        total_count, total_rating_sum = self.__aggregates.get(year, (0, Decimal(0)))
+        self.__aggregates[year] = (total_count + count, total_rating_sum + rating_sum)
+
+    def __query(self, index, partition, limit=None, cursor=None, fields=None, forward=True, extra_attributes=()):
+        """1 つのパーティションを Query と同じ順序・ページ分割で読む"""
+        partition_key, sort_key = _INDEXES[index]
+        start = decode_cursor(cursor)
+        if start is not None:
+            try:
+                start = (start[sort_key], start["PK"], start["SK"])
+            except KeyError as err:
+                raise ValueError("Invalid cursor") from err
+        with self.__lock:
+            entries = self.__indexes[index].get(partition, [])
+            if forward:
+                position = 0 if start is None else bisect_right(entries, start)
+                end = len(entries) if limit is None else position + limit
+                page = entries[position:end]
+            else:
+                position = len(entries) if start is None else bisect_left(entries, start)
+                begin = 0 if limit is None else max(position - limit, 0)
+                page = entries[begin:position][::-1]
+            items = [self.__project(self.__items[(pk, sk)], fields, extra_attributes) for _, pk, sk in page]
+
+        # DynamoDB と同様に、Limit に達した場合は続きがなくても LastEvaluatedKey を返す
+        next_cursor = None
+        if limit is not None and len(page) == limit:
+            sort_value, pk, sk = page[-1]
+            last_evaluated_key = {"PK": pk, "SK": sk}
+            if index is not None:
+                last_evaluated_key[partition_key] = partition
+                last_evaluated_key[sort_key] = sort_value
+            next_cursor = encode_cursor(last_evaluated_key)
+        return items, next_cursor
+
+    def __project(self, item, fields=None, extra_attributes=()):
+        """movie_projection と同じ属性だけを持つコピーを返す"""
+        if not fields:
+            projected = {"PK": item["PK"], "SK": item["SK"], "info": dict(item["info"])}
+        else:
+            projected = {}
+            if "year" in fields:
+                projected["PK"] = item["PK"]
+            if "title" in fields:
+                projected["SK"] = item["SK"]
+            info = {name: item["info"][name] for name in ("plot", "rating") if name in fields}
+            if info:
+                projected["info"] = info
+        for attribute in extra_attributes:
+            projected[attribute] = item[attribute]
+        return projected
@@ -0,0 +1,104 @@
+from logging import getLogger
+
+from domain.entity.movie import MovieForm
+from repository.delegating_movie_repo import DelegatingMovieRepo
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+from usecase.interface.i_movie_index import IMovieIndex
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+
+class IndexedMovieRepo(DelegatingMovieRepo):
+    """書き込みが成功した映画をプロセス内のインデックス（検索など）に反映するラッパー
+
+    他プロセスからの書き込みは反映されないため、インデックスは再起動時の作成までの間ずれる。
+    """
+
+    def __init__(self, inner: IMovieRepo, indexes: list[IMovieIndex]):
+        super().__init__(inner)
+        self.__indexes = indexes
+
+    def add_movie(self, data: MovieForm):
+        result = self._inner.add_movie(data)
+        self.__put(data)
+        return result
+
+    def batch_add_movies(self, data: list[MovieForm]):
+        errors = self._inner.batch_add_movies(data)
+        for form, error in zip(data, errors):
+            if error is None:
+                self.__put(form)
+        return errors
+
+    def update_movie(self, data: MovieForm):
+        result = self._inner.update_movie(data)
+        self.__put(data)
+        return result
+
+    def delete_movie(self, title, year):
+        result = self._inner.delete_movie(title, year)
+        self.__remove(year, title)
+        return result
+
+    def batch_delete_movies(self, keys):
+        errors = self._inner.batch_delete_movies(keys)
+        for (year, title), error in zip(keys, errors):
+            if error is None:
+                self.__remove(year, title)
+        return errors
+
+    def transact_write_movies(self, operations):
+        result = self._inner.transact_write_movies(operations)
+        for operation in operations:
+            if operation.action == "delete":
+                self.__remove(operation.year, operation.title)
+            else:
+                self.__put(operation.to_form())
+        return result
+
+    def __put(self, data: MovieForm) -> None:
+        for index in self.__indexes:
+            index.put(data.year, data.title, data.plot, data.rating)
+
+    def __remove(self, year, title) -> None:
+        for index in self.__indexes:
+            index.remove(int(year), title)
+
+
+class IndexedAsyncMovieRepo(IAsyncMovieRepo):
+    """IndexedMovieRepo の非同期リポジトリ版"""
+
+    def __init__(self, inner: IAsyncMovieRepo, indexes: list[IMovieIndex]):
+        self._inner = inner
+        self.__indexes = indexes
+
+    async def add_movie(self, data: MovieForm):
+        result = await self._inner.add_movie(data)
+        self.__put(data)
+        return result
+
+    async def get_movie(self, year, title):
+        return await self._inner.get_movie(year, title)
+
+    async def update_movie(self, data: MovieForm):
+        result = await self._inner.update_movie(data)
+        self.__put(data)
+        return result
+
+    async def query_movies(self, year, limit=None, cursor=None, fields=None):
+        return await self._inner.query_movies(year, limit, cursor, fields)
+
+    async def list_movie(self, limit=None, cursor=None, fields=None):
+        return await self._inner.list_movie(limit, cursor, fields)
+
+    async def delete_movie(self, title, year):
+        result = await self._inner.delete_movie(title, year)
+        for index in self.__indexes:
+            index.remove(int(year), title)
+        return result
+
+    def __put(self, data: MovieForm) -> None:
+        for index in self.__indexes:
+            index.put(data.year, data.title, data.plot, data.rating)
@@ -0,0 +1,73 @@
+from decimal import Decimal
+
+# 公開年ごとの件数と評価の合計を保持するアイテムのパーティションの接頭辞とソートキー
+# 映画の書き込みごとに更新されるため、1 つのパーティションに集中しないよう公開年ごとに分ける
+AGGREGATE_PARTITION_PREFIX = "Aggregate|"
+AGGREGATE_SORT_KEY = "Aggregate"
+# 全ての公開年の集計を読む場合の範囲（MovieForm の year の範囲）
+AGGREGATE_YEAR_FROM = 1972
+AGGREGATE_YEAR_TO = 2100
+
+
+def aggregate_key(year) -> dict:
+    """公開年の集計アイテムのキーを返す"""
+    return {"PK": f"{AGGREGATE_PARTITION_PREFIX}{year}", "SK": AGGREGATE_SORT_KEY}
+
+
+def aggregate_keys() -> list[dict]:
+    """全ての公開年の集計アイテムのキーを返す"""
+    return [aggregate_key(year) for year in range(AGGREGATE_YEAR_FROM, AGGREGATE_YEAR_TO + 1)]
+
+
+def aggregate_result(item: dict) -> dict:
+    """集計アイテムを aggregate_movies の戻り値の形 (year・count・rating_sum) にする"""
+    return {
+        "year": item["PK"][len(AGGREGATE_PARTITION_PREFIX):],
+        "count": item.get("count", 0),
+        "rating_sum": item.get("rating_sum", Decimal(0)),
+    }
+
+
+def aggregate_delta(old_item: dict | None, new_rating=None) -> tuple[int, Decimal]:
+    """書き込み前のアイテムと書き込み後の評価から、件数と評価の合計の増分を求める
+
+    Args:
+        old_item (dict | None): 書き込み前のアイテム（存在しなかった場合は None）
+        new_rating: 書き込み後の評価（削除の場合は None）
+
+    Returns:
+        tuple[int, Decimal]: 件数の増分と評価の合計の増分
+    """
+    count = 0
+    rating_sum = Decimal(0)
+    if old_item is not None:
+        count -= 1
+        rating_sum -= Decimal(str(old_item.get("info", {}).get("rating", 0)))
+    if new_rating is not None:
+        count += 1
+        rating_sum += Decimal(str(new_rating))
+    return count, rating_sum
+
+
+def aggregate_update(year, count: int, rating_sum: Decimal) -> dict:
+    """集計アイテムに増分を ADD する update_item の引数を返す"""
+    return {
+        "Key": aggregate_key(year),
+        "UpdateExpression": "ADD #count :c, #rating_sum :r",
+        "ExpressionAttributeNames": {"#count": "count", "#rating_sum": "rating_sum"},
+        "ExpressionAttributeValues": {":c": count, ":r": rating_sum},
+    }
+
+
+def aggregate_item(year, count: int, rating_sum) -> dict:
+    """集計アイテムを上書きする put_item の Item を返す"""
+    return {**aggregate_key(year), "count": count, "rating_sum": Decimal(str(rating_sum))}
+
+
+def sum_aggregate_deltas(deltas) -> dict:
+    """(公開年, 件数の増分, 評価の合計の増分) を公開年ごとに合計する"""
+    totals = {}
+    for year, count, rating_sum in deltas:
+        total_count, total_rating_sum = totals.get(str(year), (0, Decimal(0)))
+        totals[str(year)] = (total_count + count, total_rating_sum + rating_sum)
+    return totals
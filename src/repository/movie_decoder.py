@@ -0,0 +1,47 @@
+from boto3.dynamodb.types import DYNAMODB_CONTEXT
+
+
+def decode_movie_item(item: dict) -> dict:
+    """DynamoDB の AttributeValue 形式の映画アイテムを Python の値に変換する
+
+    TypeDeserializer のように全属性の型を調べて Decimal を生成する代わりに、
+    映画アイテムの固定の形 (PK, SK, info.plot, info.rating と GSI1SK) だけを直接読み出す。
+    Movie.to_dict / Movie.to_fields がそのまま受け取れる dict を返す。
+    rating は他の経路（TypeDeserializer）と同じく Decimal で返す。
+    """
+    decoded = {}
+    pk = item.get("PK")
+    if pk is not None:
+        decoded["PK"] = pk["S"]
+    sk = item.get("SK")
+    if sk is not None:
+        decoded["SK"] = sk["S"]
+    info = item.get("info")
+    if info is not None:
+        attributes = info["M"]
+        decoded_info = {}
+        plot = attributes.get("plot")
+        if plot is not None:
+            decoded_info["plot"] = plot["S"]
+        rating = attributes.get("rating")
+        if rating is not None:
+            decoded_info["rating"] = DYNAMODB_CONTEXT.create_decimal(rating["N"])
+        decoded["info"] = decoded_info
+    gsi1sk = item.get("GSI1SK")
+    if gsi1sk is not None:
+        decoded["GSI1SK"] = gsi1sk["S"]
+    return decoded
+
+
+def encode_key(key: dict | None) -> dict | None:
+    """文字列のキー属性を AttributeValue 形式に変換する"""
+    if key is None:
+        return None
+    return {name: {"S": value} for name, value in key.items()}
+
+
+def decode_key(key: dict | None) -> dict | None:
+    """AttributeValue 形式のキー属性を文字列に戻す"""
+    if key is None:
+        return None
+    return {name: value["S"] for name, value in key.items()}
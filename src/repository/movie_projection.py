@@ -0,0 +1,44 @@
+# API の項目名と DynamoDB の属性パスの対応（GSI のキー属性は読み込まない）
+_FIELD_PATHS = {
+    "year": "#pk",
+    "title": "#sk",
+    "plot": "#info.#plot",
+    "rating": "#info.#rating",
+}
+
+_ATTRIBUTE_NAMES = {
+    "#pk": "PK",
+    "#sk": "SK",
+    "#info": "info",
+    "#plot": "plot",
+    "#rating": "rating",
+}
+
+
+def movie_projection(fields: tuple[str, ...] | None = None, extra_attributes: tuple[str, ...] = ()) -> dict:
+    """Query / GetItem に渡す ProjectionExpression を組み立てる
+
+    Args:
+        fields (tuple[str, ...] | None): 取得する項目（None の場合は映画の全項目）
+        extra_attributes (tuple[str, ...]): 結果の並べ替えなどに追加で必要な属性
+
+    Returns:
+        dict: ProjectionExpression と ExpressionAttributeNames
+    """
+    if not fields:
+        paths = ["#pk", "#sk", "#info"]
+    else:
+        paths = [_FIELD_PATHS[field] for field in fields]
+    names = {
+        name: attribute
+        for name, attribute in _ATTRIBUTE_NAMES.items()
+        if any(name in path.split(".") for path in paths)
+    }
+    for attribute in extra_attributes:
+        name = f"#{attribute.lower()}"
+        paths.append(name)
+        names[name] = attribute
+    return {
+        "ProjectionExpression": ", ".join(paths),
+        "ExpressionAttributeNames": names,
+    }
@@ -6,24 +6,69 @@ from zipfile import ZipFile
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 
+from core.config import env_vars
+from core.dynamodb import TableHandle, decode_cursor, encode_cursor, get_dynamodb_resource
+from repository.dynamodb_batch import batch_get, batch_write
 from domain.entity.movie import Movie, MovieForm
+from repository.movie_aggregates import (
+    aggregate_delta,
+    aggregate_item,
+    aggregate_key,
+    aggregate_keys,
+    aggregate_result,
+    aggregate_update,
+    sum_aggregate_deltas,
+)
+from repository.movie_projection import movie_projection
+from repository.movie_shards import decode_shard_cursor, encode_shard_cursor, split_limit
 from usecase.interface.i_movie_repo import IMovieRepo
 
 LOGGER = logging.getLogger(__name__)
 
+# プロセス内で共有するテーブルハンドル
+movie_table = TableHandle(
+    get_dynamodb_resource,
+    env_vars.DYNAMODB_TABLE_NAME,
+    ttl_seconds=env_vars.DYNAMODB_TABLE_TTL_SECONDS,
+)
+
+# TransactWriteItems の 1 リクエストあたりの上限件数
+TRANSACT_WRITE_LIMIT = 100
+
+# 分割されたパーティションを並列に読むためのスレッドプール
+_shard_executor = ThreadPoolExecutor(
+    max_workers=env_vars.DYNAMODB_MAX_POOL_CONNECTIONS,
+    thread_name_prefix="movie-shard",
+)
+
 class MovieRepo(IMovieRepo):
 
-    def __init__(self):
-        self.__table_name = "dev-manage-photo"
-        self.__client = boto3.resource("dynamodb", endpoint_url="http://localhost:3000")
-        self.__table = None
+    def __init__(
+        self,
+        table_handle: TableHandle = movie_table,
+        list_shards: int = env_vars.MOVIE_LIST_SHARDS,
+        aggregates_enabled: bool = env_vars.MOVIE_AGGREGATES_ENABLED,
+    ):
+        self.__table_handle = table_handle
+        self.__table_name = table_handle.name
+        self.__list_shards = list_shards
+        self.__aggregates_enabled = aggregates_enabled
+
+    @property
+    def __table(self):
+        return self.__table_handle.get()
+
+    @property
+    def __client(self):
+        # リソースはスレッドセーフではないため、呼び出したスレッド用のものを使う
+        return self.__table_handle.resource
     
     def exists(self):
         try:
-            table = self.__client.Table(self.__table_name)
-            table.load()
+            self.__table_handle.get()
             exists = True
         except ClientError as err:
             if err.response["Error"]["Code"] == "ResourceNotFoundException":
@@ -36,13 +81,11 @@ class MovieRepo(IMovieRepo):
                     err.response["Error"]["Message"],
                 )
                 raise
-        else:
-            self.__table = table
         return exists
     
     def create_table(self):
         try:
-            self.__table = self.__client.create_table(
+            table = self.__client.create_table(
                 TableName=self.__table_name,
                 KeySchema=[
                     {"AttributeName": "PK", "KeyType": "HASH"},
@@ -91,7 +134,7 @@ class MovieRepo(IMovieRepo):
                     },
                 ],
             )
-            self.__table.wait_until_exists()
+            table.wait_until_exists()
         except ClientError as err:
             LOGGER.error(
                 "Couldn't create table %s. Here's why: %s: %s",
@@ -101,7 +144,8 @@ class MovieRepo(IMovieRepo):
             )
             raise
         else:
-            return self.__table
+            self.__table_handle.set(table)
+            return table
 
     def list_tables(self):
         try:
@@ -120,62 +164,133 @@ class MovieRepo(IMovieRepo):
             return tables
     
     def add_movie(self, data: MovieForm):
-        item = Movie.to_db(data)
+        item = Movie.to_db(data, self.__list_shards)
         try:
-            self.__table.put_item(Item=item)
+            response = self.__table.put_item(Item=item, ReturnValues="ALL_OLD")
         except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
                 "Couldn't add movie %s to table %s. Here's why: %s: %s",
                 data.title,
-                self.__table.name,
+                self.__table_name,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
             raise
+        else:
+            self.__add_aggregate(data.year, response.get("Attributes"), data.rating)
+    
+    def batch_add_movies(self, data: list[MovieForm]):
+        # 同一キーは最後の要素を書き込み、重複分も同じ結果を返す
+        latest = {}
+        for index, form in enumerate(data):
+            latest[(form.year, form.title)] = index
+        unique_indexes = list(latest.values())
+        # 集計の増分を求めるため、上書きされるアイテムを先に読んでおく
+        # 読み込みから書き込みまでの間に同じキーへ書き込まれた場合、集計はずれる
+        old_items = None
+        if self.__aggregates_enabled:
+            old_items = self.batch_get_movies([(data[index].year, data[index].title) for index in unique_indexes])
+        requests = [
+            {"PutRequest": {"Item": Movie.to_db(data[index], self.__list_shards)}}
+            for index in unique_indexes
+        ]
+        errors = batch_write(
+            self.__table.meta.client,
+            self.__table_name,
+            requests,
+            max_workers=env_vars.DYNAMODB_BATCH_CONCURRENCY,
+            max_attempts=env_vars.DYNAMODB_BATCH_MAX_ATTEMPTS,
+        )
+        error_by_key = {
+            (data[index].year, data[index].title): error
+            for index, error in zip(unique_indexes, errors)
+        }
+        if old_items is not None:
+            deltas = sum_aggregate_deltas(
+                (data[index].year, *aggregate_delta(old_item, data[index].rating))
+                for index, old_item, error in zip(unique_indexes, old_items, errors)
+                if error is None
+            )
+            for year, (count, rating_sum) in deltas.items():
+                self.__apply_aggregate(year, count, rating_sum)
+        return [error_by_key[(form.year, form.title)] for form in data]
     
     def get_movie(self, year, title):
         try:
-            response = self.__table.get_item(Key={"PK": f"Movie|{str(year)}", "SK": title})
+            response = self.__table.get_item(Key={"PK": f"Movie|{str(year)}", "SK": title}, **movie_projection())
         except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
                 "Couldn't get movie %s from table %s. Here's why: %s: %s",
                 title,
-                self.__table.name,
+                self.__table_name,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
+            # 存在しない映画 (None) と区別できるよう、エラーは呼び出し元に返す
+            raise
         else:
             if not "Item" in response:
                 return None
             
             return response["Item"]
     
-    def update_movie(self, data: MovieForm):
+    def batch_get_movies(self, keys):
+        unique_keys = {(str(year), title): None for year, title in keys}
+        request_keys = [{"PK": f"Movie|{year}", "SK": title} for year, title in unique_keys]
         try:
-            response = self.__table.update_item(
-                Key={"PK": f"Movie|{str(data.year)}", "SK": data.title},
-                UpdateExpression="set info.rating=:r, info.plot=:p",
-                ExpressionAttributeValues={":r": Decimal(data.rating), ":p": data.plot},
-                ReturnValues="UPDATED_NEW",
+            items = batch_get(
+                self.__table.meta.client,
+                self.__table_name,
+                request_keys,
+                max_workers=env_vars.DYNAMODB_BATCH_CONCURRENCY,
+                max_attempts=env_vars.DYNAMODB_BATCH_MAX_ATTEMPTS,
             )
         except ClientError as err:
+            self.__table_handle.handle_error(err)
+            raise
+        return [items.get((f"Movie|{year}", title)) for year, title in keys]
+    
+    def __update_args(self, data: MovieForm) -> dict:
+        """update_item / TransactWriteItems の Update に共通の引数を返す"""
+        return {
+            "Key": {"PK": f"Movie|{str(data.year)}", "SK": data.title},
+            "UpdateExpression": "set info.rating=:r, info.plot=:p, GSI1PK=:p1, GSI1SK=:s, GSI2PK=:p2, GSI2SK=:s",
+            "ExpressionAttributeValues": {
+                ":r": Decimal(str(data.rating)),
+                ":p": data.plot,
+                ":p1": Movie.list_partition(data.year, data.title, self.__list_shards),
+                ":p2": f"Movie|{data.year}",
+                ":s": Movie.rating_key(data.rating, data.title),
+            },
+        }
+
+    def update_movie(self, data: MovieForm):
+        try:
+            response = self.__table.update_item(**self.__update_args(data), ReturnValues="ALL_OLD")
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
                 "Couldn't update movie %s in table %s. Here's why: %s: %s",
                 data.title,
-                self.__table.name,
+                self.__table_name,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
             raise
         else:
-            return response["Attributes"]
+            self.__add_aggregate(data.year, response["Attributes"], data.rating)
+            # インデックス用の属性は返さない
+            return {"info": {"rating": Decimal(str(data.rating)), "plot": data.plot}}
     
-    def query_movies(self, year):
+    def query_movies(self, year, limit=None, cursor=None, fields=None):
         try:
             key_condition = Key("PK").eq(f"Movie|{str(year)}")
-            kwargs = {"KeyConditionExpression": key_condition}
-            response = self.__table.query(**kwargs)
+            kwargs = {"KeyConditionExpression": key_condition, **movie_projection(fields)}
+            return self._query_page(kwargs, limit, cursor)
         except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
                 "Couldn't query for movies released in %s. Here's why: %s: %s",
                 year,
@@ -183,35 +298,361 @@ class MovieRepo(IMovieRepo):
                 err.response["Error"]["Message"],
             )
             raise
-        else:
-            return response["Items"]
     
-    def list_movie(self):
+    def list_movie(self, limit=None, cursor=None, fields=None):
+        if self.__list_shards <= 1:
+            return self.__list_partition("Movie", limit, cursor, fields)
+
+        # 全パーティションを並列に読み、結果を連結する
+        shard_cursors = decode_shard_cursor(cursor, self.__list_shards)
+        shard_limit = split_limit(limit, len(shard_cursors))
+        partitions = Movie.list_partitions(self.__list_shards)
+        futures = {
+            shard: _shard_executor.submit(self.__list_partition, partitions[shard], shard_limit, shard_cursor, fields)
+            for shard, shard_cursor in shard_cursors.items()
+        }
+        items = []
+        next_cursors = {}
+        for shard, future in futures.items():
+            shard_items, next_cursors[shard] = future.result()
+            items.extend(shard_items)
+        return items, encode_shard_cursor(next_cursors)
+
+    def __list_partition(self, partition, limit=None, cursor=None, fields=None):
         try:
-            key_condition = Key("GSI1PK").eq("Movie")
+            key_condition = Key("GSI1PK").eq(partition)
             kwargs = {
                 "IndexName": "GSIndex1",
-                "KeyConditionExpression": key_condition
+                "KeyConditionExpression": key_condition,
+                **movie_projection(fields),
             }
+            return self._query_page(kwargs, limit, cursor)
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't query for movie list in %s. Here's why: %s: %s",
+                partition,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def top_movies(self, limit, year=None, fields=None):
+        try:
+            if year is not None:
+                # 年ごとの評価順インデックスを 1 回の Query で読む
+                kwargs = {
+                    "IndexName": "GSIndex2",
+                    "KeyConditionExpression": Key("GSI2PK").eq(f"Movie|{str(year)}"),
+                    "ScanIndexForward": False,
+                    **movie_projection(fields),
+                }
+                items, _ = self._query_page(kwargs, limit)
+                return items
+
+            # 全体の上位は各パーティションの上位 limit 件を集めて並べ替える
+            def top_of_partition(partition):
+                kwargs = {
+                    "IndexName": "GSIndex1",
+                    "KeyConditionExpression": Key("GSI1PK").eq(partition),
+                    "ScanIndexForward": False,
+                    **movie_projection(fields, extra_attributes=("GSI1SK",)),
+                }
+                items, _ = self._query_page(kwargs, limit)
+                return items
+
+            partitions = Movie.list_partitions(self.__list_shards)
+            if len(partitions) == 1:
+                items = top_of_partition(partitions[0])
+            else:
+                items = [
+                    item
+                    for page in _shard_executor.map(top_of_partition, partitions)
+                    for item in page
+                ]
+                items.sort(key=lambda item: item["GSI1SK"], reverse=True)
+            return items[:limit]
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't query for top rated movies. Here's why: %s: %s",
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def complete_titles(self, year, prefix, limit):
+        try:
+            key_condition = Key("PK").eq(f"Movie|{str(year)}") & Key("SK").begins_with(prefix)
+            kwargs = {"KeyConditionExpression": key_condition, **movie_projection(("year", "title"))}
+            items, _ = self._query_page(kwargs, limit)
+            return items
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't query for titles starting with %s in %s. Here's why: %s: %s",
+                prefix,
+                year,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def has_unmigrated_index_items(self):
+        # 古い形式の映画は GSI1SK が "-" のため、各パーティションを Limit=1 で確かめる
+        # （シャード分割前のパーティション "Movie" に残っている場合も含める）
+        partitions = dict.fromkeys(Movie.list_partitions(self.__list_shards) + ["Movie"])
+        try:
+            for partition in partitions:
+                response = self.__table.query(
+                    IndexName="GSIndex1",
+                    KeyConditionExpression=Key("GSI1PK").eq(partition) & Key("GSI1SK").eq("-"),
+                    ProjectionExpression="PK",
+                    Limit=1,
+                )
+                if response["Items"]:
+                    return True
+            return False
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't check movie index migration. Here's why: %s: %s",
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def count_movies(self, year=None):
+        try:
+            if year is not None:
+                return self.__count({"KeyConditionExpression": Key("PK").eq(f"Movie|{str(year)}")})
+
+            partitions = Movie.list_partitions(self.__list_shards)
+            return sum(_shard_executor.map(
+                lambda partition: self.__count({
+                    "IndexName": "GSIndex1",
+                    "KeyConditionExpression": Key("GSI1PK").eq(partition),
+                }),
+                partitions,
+            ))
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't count movies released in %s. Here's why: %s: %s",
+                "all years" if year is None else year,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def __count(self, kwargs):
+        # Select=COUNT はアイテムを返さないが、1 MB ごとのページ分割は通常の Query と同じ
+        kwargs = {**kwargs, "Select": "COUNT"}
+        count = 0
+        while True:
             response = self.__table.query(**kwargs)
+            count += response["Count"]
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if last_evaluated_key is None:
+                return count
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+    def aggregate_movies(self, year=None):
+        try:
+            if year is not None:
+                response = self.__table.get_item(Key=aggregate_key(year))
+                return [aggregate_result(response["Item"])] if "Item" in response else []
+
+            # 集計は公開年ごとのパーティションにあるため、公開年の範囲を BatchGetItem で読む
+            keys = aggregate_keys()
+            items = batch_get(
+                self.__table.meta.client,
+                self.__table_name,
+                keys,
+                max_workers=env_vars.DYNAMODB_BATCH_CONCURRENCY,
+                max_attempts=env_vars.DYNAMODB_BATCH_MAX_ATTEMPTS,
+            )
+            return [aggregate_result(items[(key["PK"], key["SK"])]) for key in keys if (key["PK"], key["SK"]) in items]
         except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
-                "Couldn't query for movie list. Here's why: %s: %s",
+                "Couldn't get movie aggregates from table %s. Here's why: %s: %s",
+                self.__table_name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def put_movie_aggregates(self, aggregates):
+        requests = [
+            {"PutRequest": {"Item": aggregate_item(year, count, rating_sum)}}
+            for year, (count, rating_sum) in aggregates.items()
+        ]
+        errors = batch_write(
+            self.__table.meta.client,
+            self.__table_name,
+            requests,
+            max_workers=env_vars.DYNAMODB_BATCH_CONCURRENCY,
+            max_attempts=env_vars.DYNAMODB_BATCH_MAX_ATTEMPTS,
+        )
+        return errors
+
+    def _query_page(self, kwargs, limit=None, cursor=None):
+        """Query を 1 ページ分実行し、(Items, 次ページのカーソル) を返す"""
+        if limit is not None:
+            kwargs["Limit"] = limit
+        exclusive_start_key = decode_cursor(cursor)
+        if exclusive_start_key is not None:
+            kwargs["ExclusiveStartKey"] = exclusive_start_key
+        response = self.__table.query(**kwargs)
+        return response["Items"], encode_cursor(response.get("LastEvaluatedKey"))
+        
+    def scan_movies(self, segment, total_segments, limit=None, cursor=None):
+        try:
+            kwargs = {
+                "Segment": segment,
+                "TotalSegments": total_segments,
+                "ReturnConsumedCapacity": "TOTAL",
+                # 集計アイテムは映画ではないため読み飛ばす
+                "FilterExpression": Attr("PK").begins_with("Movie|"),
+            }
+            if limit is not None:
+                kwargs["Limit"] = limit
+            exclusive_start_key = decode_cursor(cursor)
+            if exclusive_start_key is not None:
+                kwargs["ExclusiveStartKey"] = exclusive_start_key
+            response = self.__table.scan(**kwargs)
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't scan segment %s of table %s. Here's why: %s: %s",
+                segment,
+                self.__table_name,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
             raise
         else:
-            return response["Items"]
+            consumed = response.get("ConsumedCapacity", {}).get("CapacityUnits", 0)
+            return response["Items"], encode_cursor(response.get("LastEvaluatedKey")), consumed
         
     def delete_movie(self, title, year):
         try:
-            self.__table.delete_item(Key={"PK": f"Movie|{str(year)}", "SK": title})
+            response = self.__table.delete_item(
+                Key={"PK": f"Movie|{str(year)}", "SK": title},
+                ReturnValues="ALL_OLD",
+            )
         except ClientError as err:
+            self.__table_handle.handle_error(err)
             LOGGER.error(
                 "Couldn't delete movie %s. Here's why: %s: %s",
                 title,
                 err.response["Error"]["Code"],
                 err.response["Error"]["Message"],
             )
-            raise
\ No newline at end of file
+            raise
+        else:
+            self.__add_aggregate(year, response.get("Attributes"))
+
+    def batch_delete_movies(self, keys):
+        # 同一キーは 1 回だけ削除し、重複分も同じ結果を返す
+        unique_keys = list({(str(year), title): None for year, title in keys})
+        old_items = None
+        if self.__aggregates_enabled:
+            old_items = self.batch_get_movies(unique_keys)
+        requests = [
+            {"DeleteRequest": {"Key": {"PK": f"Movie|{year}", "SK": title}}}
+            for year, title in unique_keys
+        ]
+        errors = batch_write(
+            self.__table.meta.client,
+            self.__table_name,
+            requests,
+            max_workers=env_vars.DYNAMODB_BATCH_CONCURRENCY,
+            max_attempts=env_vars.DYNAMODB_BATCH_MAX_ATTEMPTS,
+        )
+        if old_items is not None:
+            deltas = sum_aggregate_deltas(
+                (year, *aggregate_delta(old_item))
+                for (year, _), old_item, error in zip(unique_keys, old_items, errors)
+                if error is None
+            )
+            for year, (count, rating_sum) in deltas.items():
+                self.__apply_aggregate(year, count, rating_sum)
+        error_by_key = dict(zip(unique_keys, errors))
+        return [error_by_key[(str(year), title)] for year, title in keys]
+
+    def transact_write_movies(self, operations):
+        old_items = [None] * len(operations)
+        if self.__aggregates_enabled:
+            old_items = self.batch_get_movies([(operation.year, operation.title) for operation in operations])
+
+        items = []
+        deltas = []
+        for operation, old_item in zip(operations, old_items):
+            key = {"PK": f"Movie|{operation.year}", "SK": operation.title}
+            if operation.action == "put":
+                request = {"Put": {"Item": Movie.to_db(operation.to_form(), self.__list_shards)}}
+            elif operation.action == "update":
+                request = {"Update": {**self.__update_args(operation.to_form()), "ConditionExpression": "attribute_exists(PK)"}}
+            else:
+                request = {"Delete": {"Key": key}}
+            action = next(iter(request.values()))
+            action["TableName"] = self.__table_name
+
+            if self.__aggregates_enabled and not (operation.action == "update" and old_item is None):
+                # 事前に読んだ内容から変わっていないことを条件にし、集計の増分をトランザクションに含める
+                if old_item is None:
+                    action["ConditionExpression"] = "attribute_not_exists(PK)"
+                else:
+                    guard = "info.rating = :old_rating"
+                    action["ConditionExpression"] = f"{action['ConditionExpression']} AND {guard}" if "ConditionExpression" in action else guard
+                    action["ExpressionAttributeValues"] = {
+                        **action.get("ExpressionAttributeValues", {}),
+                        ":old_rating": old_item["info"]["rating"],
+                    }
+                new_rating = None if operation.action == "delete" else operation.rating
+                deltas.append((operation.year, *aggregate_delta(old_item, new_rating)))
+            items.append(request)
+
+        for year, (count, rating_sum) in sum_aggregate_deltas(deltas).items():
+            if count != 0 or rating_sum != 0:
+                items.append({"Update": {"TableName": self.__table_name, **aggregate_update(year, count, rating_sum)}})
+        if len(items) > TRANSACT_WRITE_LIMIT:
+            raise ValueError(f"Too many items in one transaction: {len(items)} (max {TRANSACT_WRITE_LIMIT})")
+
+        try:
+            self.__table.meta.client.transact_write_items(TransactItems=items)
+        except ClientError as err:
+            self.__table_handle.handle_error(err)
+            LOGGER.error(
+                "Couldn't write %s movies in a transaction. Here's why: %s: %s",
+                len(operations),
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
+
+    def __add_aggregate(self, year, old_item, new_rating=None):
+        """書き込み前後の差分を公開年の集計に反映する"""
+        if not self.__aggregates_enabled:
+            return
+        count, rating_sum = aggregate_delta(old_item, new_rating)
+        self.__apply_aggregate(year, count, rating_sum)
+
+    def __apply_aggregate(self, year, count, rating_sum):
+        if count == 0 and rating_sum == 0:
+            return
+        try:
+            self.__table.update_item(**aggregate_update(year, count, rating_sum))
+        except ClientError as err:
+            # 映画の書き込みは完了しているため失敗させず、集計のずれはログに残す
+            # ずれた集計は python -m scripts.rebuild_movie_aggregates で作り直せる
+            LOGGER.error(
+                "Couldn't update movie aggregate for %s (count %+d, rating sum %s). Here's why: %s: %s",
+                year,
+                count,
+                rating_sum,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
\ No newline at end of file
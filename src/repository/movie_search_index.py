@@ -0,0 +1,182 @@
+import math
+import re
+import threading
+import unicodedata
+
+from usecase.interface.i_movie_search_index import IMovieSearchIndex
+
+# 項目ごとの重み（タイトルの一致をあらすじの一致より高く評価する）
+_FIELD_WEIGHTS = {"title": 2.0, "plot": 1.0}
+# n-gram による部分一致の重み（単語として一致した場合に対する割合）
+_PARTIAL_WEIGHT = 0.5
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """全角・半角と大文字・小文字の違いをなくす"""
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """正規化した文字列を単語（英数字・かな・漢字の連続）に分ける"""
+    return _TOKEN_PATTERN.findall(normalize(text))
+
+
+def ngrams(token: str, n: int) -> set[str]:
+    """単語の文字 n-gram を返す（n 文字未満の単語は空）"""
+    return {token[i:i + n] for i in range(len(token) - n + 1)}
+
+
+class MovieSearchIndex(IMovieSearchIndex):
+    """タイトルとあらすじの転置インデックス
+
+    単語ごとに映画と重み付きの出現回数を持ち、ngram が 1 以上の場合は単語の文字 n-gram から
+    部分一致の候補も引けるようにする（空白で区切られない日本語のタイトル向け）。
+    検索結果は IDF と項目の重みによるスコアの高い順に並べ、DynamoDB には問い合わせない。
+    """
+
+    def __init__(self, ngram: int = 2):
+        self.__ngram = ngram
+        self.__lock = threading.RLock()
+        # (year, title) -> 検索結果に返す値と正規化したタイトル・あらすじ
+        self.__documents = {}
+        # 単語 -> (year, title) -> 重み付きの出現回数
+        self.__postings = {}
+        # n-gram -> (year, title) の集合
+        self.__grams = {}
+        # 作成中に put / remove されたキー（Scan の古い内容で上書きしない）
+        self.__building = False
+        self.__dirty = set()
+
+    def start_build(self) -> None:
+        with self.__lock:
+            self.__building = True
+            self.__dirty = set()
+
+    def load(self, items: list[dict]) -> None:
+        with self.__lock:
+            for item in items:
+                info = item.get("info", {})
+                key = (int(item["PK"].split("|", 1)[1]), item["SK"])
+                if key in self.__dirty:
+                    continue
+                self.__put(key, info.get("plot", ""), float(info.get("rating", 0)))
+
+    def finish_build(self) -> None:
+        with self.__lock:
+            self.__building = False
+            self.__dirty = set()
+
+    def put(self, year: int, title: str, plot: str, rating: float) -> None:
+        key = (int(year), title)
+        with self.__lock:
+            if self.__building:
+                self.__dirty.add(key)
+            self.__put(key, plot, float(rating))
+
+    def remove(self, year: int, title: str) -> None:
+        key = (int(year), title)
+        with self.__lock:
+            if self.__building:
+                self.__dirty.add(key)
+            self.__remove(key)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> tuple[list[dict], int]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], 0
+
+        with self.__lock:
+            total = len(self.__documents)
+            scores = None
+            for term in terms:
+                weights = self.__match(term)
+                if not weights:
+                    return [], 0
+                idf = math.log(1 + total / len(weights))
+                if scores is None:
+                    scores = {key: weight * idf for key, weight in weights.items()}
+                else:
+                    # 全てのキーワードを含む映画のみを残す
+                    scores = {key: score + weights[key] * idf for key, score in scores.items() if key in weights}
+                    if not scores:
+                        return [], 0
+
+            ranked = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))
+            items = []
+            for (year, title), score in ranked[offset:offset + limit]:
+                document = self.__documents[(year, title)]
+                items.append({
+                    "year": year,
+                    "title": title,
+                    "plot": document["plot"],
+                    "rating": document["rating"],
+                    "score": round(score, 6),
+                })
+            return items, len(ranked)
+
+    def __match(self, term: str) -> dict:
+        """単語に一致する映画と重みを返す（単語としての一致を部分一致より優先する）"""
+        weights = dict(self.__postings.get(term, {}))
+        if self.__ngram <= 0 or len(term) < self.__ngram:
+            return weights
+
+        candidates = None
+        for gram in ngrams(term, self.__ngram):
+            keys = self.__grams.get(gram)
+            if not keys:
+                return weights
+            candidates = set(keys) if candidates is None else candidates & keys
+        for key in candidates - weights.keys():
+            # n-gram がすべて含まれていても連続しているとは限らないため、文字列で確かめる
+            document = self.__documents[key]
+            weight = sum(
+                _FIELD_WEIGHTS[field]
+                for field in _FIELD_WEIGHTS
+                if term in document[f"normalized_{field}"]
+            )
+            if weight:
+                weights[key] = weight * _PARTIAL_WEIGHT
+        return weights
+
+    def __put(self, key, plot, rating) -> None:
+        self.__remove(key)
+        document = {
+            "plot": plot,
+            "rating": rating,
+            "normalized_title": normalize(key[1]),
+            "normalized_plot": normalize(plot),
+        }
+        self.__documents[key] = document
+        for term, weight in self.__terms(key[1], plot).items():
+            self.__postings.setdefault(term, {})[key] = weight
+            if self.__ngram > 0:
+                for gram in ngrams(term, self.__ngram):
+                    self.__grams.setdefault(gram, set()).add(key)
+
+    def __remove(self, key) -> None:
+        document = self.__documents.pop(key, None)
+        if document is None:
+            return
+        for term in self.__terms(key[1], document["plot"]):
+            postings = self.__postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.__postings[term]
+            if self.__ngram > 0:
+                for gram in ngrams(term, self.__ngram):
+                    keys = self.__grams.get(gram)
+                    if keys is not None:
+                        keys.discard(key)
+                        if not keys:
+                            del self.__grams[gram]
+
+    def __terms(self, title, plot) -> dict:
+        """タイトルとあらすじの単語ごとの重み付き出現回数を返す"""
+        terms = {}
+        for field, text in (("title", title), ("plot", plot)):
+            for term in tokenize(text):
+                terms[term] = terms.get(term, 0) + _FIELD_WEIGHTS[field]
+        return terms
@@ -0,0 +1,38 @@
+from core.dynamodb import decode_cursor, encode_cursor
+
+
+def decode_shard_cursor(cursor: str | None, shards: int) -> dict[int, str | None]:
+    """分割されたパーティションごとのカーソルに戻す
+
+    最初のページ（cursor が None）では全パーティションを先頭から読み、
+    以降は続きがあるパーティションのみを読む。
+
+    Raises:
+        ValueError: カーソルの形式が不正な場合
+    """
+    if cursor is None:
+        return {shard: None for shard in range(shards)}
+    cursors = decode_cursor(cursor)
+    try:
+        shard_cursors = {int(shard): value for shard, value in cursors.items()}
+    except ValueError as err:
+        raise ValueError("Invalid cursor") from err
+    if not all(0 <= shard < shards for shard in shard_cursors):
+        raise ValueError("Invalid cursor")
+    # 各パーティションのカーソルも検証しておく
+    for value in shard_cursors.values():
+        decode_cursor(value)
+    return shard_cursors
+
+
+def encode_shard_cursor(shard_cursors: dict[int, str | None]) -> str | None:
+    """続きがあるパーティションのカーソルをまとめて 1 つのカーソルにする"""
+    remaining = {str(shard): value for shard, value in shard_cursors.items() if value is not None}
+    return encode_cursor(remaining)
+
+
+def split_limit(limit: int | None, shards: int) -> int | None:
+    """1 ページの件数を各パーティションに割り振る（合計は limit + shards 未満）"""
+    if limit is None:
+        return None
+    return max(1, -(-limit // shards))
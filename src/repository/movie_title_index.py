@@ -0,0 +1,76 @@
+import threading
+from bisect import bisect_left, insort
+
+from repository.movie_search_index import normalize
+from usecase.interface.i_movie_title_index import IMovieTitleIndex
+
+
+class MovieTitleIndex(IMovieTitleIndex):
+    """全ての公開年のタイトルを正規化した文字列の順に並べた配列
+
+    前方一致の範囲を二分探索で求めるため、キー入力ごとの補完を DynamoDB に問い合わせずに返せる。
+    """
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        # (正規化したタイトル, タイトル, 公開年) のソート済みリスト
+        self.__entries = []
+        self.__keys = set()
+        # 作成中に put / remove されたキー（Scan の古い内容で上書きしない）
+        self.__building = False
+        self.__dirty = set()
+
+    def start_build(self) -> None:
+        with self.__lock:
+            self.__building = True
+            self.__dirty = set()
+
+    def load(self, items: list[dict]) -> None:
+        with self.__lock:
+            for item in items:
+                key = (int(item["PK"].split("|", 1)[1]), item["SK"])
+                if key in self.__dirty:
+                    continue
+                self.__put(key)
+
+    def finish_build(self) -> None:
+        with self.__lock:
+            self.__building = False
+            self.__dirty = set()
+
+    def put(self, year: int, title: str, plot: str, rating: float) -> None:
+        key = (int(year), title)
+        with self.__lock:
+            if self.__building:
+                self.__dirty.add(key)
+            self.__put(key)
+
+    def remove(self, year: int, title: str) -> None:
+        key = (int(year), title)
+        with self.__lock:
+            if self.__building:
+                self.__dirty.add(key)
+            if key not in self.__keys:
+                return
+            self.__keys.discard(key)
+            entry = (normalize(title), title, key[0])
+            position = bisect_left(self.__entries, entry)
+            if position < len(self.__entries) and self.__entries[position] == entry:
+                del self.__entries[position]
+
+    def complete(self, prefix: str, limit: int) -> list[dict]:
+        normalized = normalize(prefix)
+        with self.__lock:
+            position = bisect_left(self.__entries, (normalized,))
+            results = []
+            for normalized_title, title, year in self.__entries[position:position + limit]:
+                if not normalized_title.startswith(normalized):
+                    break
+                results.append({"year": year, "title": title})
+            return results
+
+    def __put(self, key) -> None:
+        if key in self.__keys:
+            return
+        self.__keys.add(key)
+        insort(self.__entries, (normalize(key[1]), key[1], key[0]))
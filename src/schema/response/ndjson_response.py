@@ -0,0 +1,26 @@
+from typing import Any, AsyncIterable, Iterable
+
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+
+def to_ndjson(items: Iterable[Any]) -> Iterable[bytes]:
+    """オブジェクトを 1 行ずつ JSON にエンコードする"""
+    for item in items:
+        yield to_json(item) + b"\n"
+
+
+async def to_ndjson_async(items: AsyncIterable[Any]) -> AsyncIterable[bytes]:
+    """非同期イテレータのオブジェクトを 1 行ずつ JSON にエンコードする"""
+    async for item in items:
+        yield to_json(item) + b"\n"
+
+
+class NDJSONResponse(StreamingResponse):
+    """改行区切り JSON (NDJSON) のストリーミングレスポンス"""
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, items: Iterable[Any] | AsyncIterable[Any], **kwargs):
+        content = to_ndjson_async(items) if hasattr(items, "__aiter__") else to_ndjson(items)
+        super().__init__(content, media_type=self.media_type, **kwargs)
@@ -0,0 +1,72 @@
+"""同期リポジトリと非同期リポジトリの同時実行スループットを比較する
+
+ローカルの DynamoDB (MovieRepo と同じエンドポイント) に対して、
+同じ件数の get_movie を以下の 3 通りで同時に実行し、1 秒あたりの処理件数を出力する。
+
+- blocking:   コルーチン内で同期の MovieRepo を直接呼ぶ（修正前のルートと同じ）
+- threadpool: 同期の MovieRepo を run_in_threadpool で実行する
+- async:      AsyncMovieRepo (aioboto3) を await する
+
+使い方（src ディレクトリで実行）:
+    python -m scripts.bench_async_repo --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from domain.entity.movie import MovieForm
+from repository.async_movie_repo import AsyncMovieRepo, async_movie_table
+from repository.movie_repo import MovieRepo
+
+BENCH_YEAR = 2099
+
+
+async def run(label, call, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await call(f"bench-{i % 100}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {requests / elapsed:10.1f} req/s  ({elapsed:.2f}s)")
+
+
+async def main(requests, concurrency):
+    repo = MovieRepo()
+    if not repo.exists():
+        repo.create_table()
+    for i in range(100):
+        repo.add_movie(MovieForm(year=BENCH_YEAR, title=f"bench-{i}", plot="benchmark", rating=3))
+
+    async_repo = AsyncMovieRepo()
+
+    async def blocking(title):
+        repo.get_movie(BENCH_YEAR, title)
+
+    async def threadpool(title):
+        await run_in_threadpool(repo.get_movie, BENCH_YEAR, title)
+
+    async def non_blocking(title):
+        await async_repo.get_movie(BENCH_YEAR, title)
+
+    try:
+        await run("blocking", blocking, requests, concurrency)
+        await run("threadpool", threadpool, requests, concurrency)
+        await run("async", non_blocking, requests, concurrency)
+    finally:
+        await async_movie_table.close()
+        for i in range(100):
+            repo.delete_movie(f"bench-{i}", BENCH_YEAR)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async movie repository throughput")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
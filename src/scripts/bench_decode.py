@@ -0,0 +1,54 @@
+"""映画アイテムのデコード処理を比較するマイクロベンチマーク
+
+DynamoDB に接続せず、AttributeValue 形式の合成アイテムを以下の 2 通りで Movie に変換し、
+1 件あたりの処理時間を出力する。
+
+- resource: TypeDeserializer で全属性を変換してから Movie.to_dict（MovieRepo と同じ）
+- fast:     decode_movie_item で必要な属性だけを読んでから Movie.to_dict（FastMovieRepo と同じ）
+
+使い方（src ディレクトリで実行）:
+    python -m scripts.bench_decode --items 1000 --repeat 20
+"""
+import argparse
+import timeit
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from domain.entity.movie import Movie
+from repository.movie_decoder import decode_movie_item
+
+
+def make_items(count):
+    return [
+        {
+            "PK": {"S": f"Movie|{1980 + i % 40}"},
+            "SK": {"S": f"bench-{i}"},
+            "info": {"M": {"plot": {"S": "benchmark plot " * 4}, "rating": {"N": str(i % 10 / 2)}}},
+        }
+        for i in range(count)
+    ]
+
+
+def main(count, repeat):
+    items = make_items(count)
+    deserializer = TypeDeserializer()
+
+    def resource():
+        for item in items:
+            Movie.to_dict({name: deserializer.deserialize(value) for name, value in item.items()})
+
+    def fast():
+        for item in items:
+            Movie.to_dict(decode_movie_item(item))
+
+    for label, func in (("resource", resource), ("fast", fast)):
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        print(f"{label:<10} {best / count * 1_000_000:8.2f} us/item  ({best * 1000:.1f}ms / {count} items)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.items, args.repeat)
@@ -0,0 +1,42 @@
+"""映画を公開年ごとの Parquet / Arrow IPC ファイルに書き出す（分析用のスナップショット）
+
+pyarrow が必要（poetry install -E export）。使い方（src ディレクトリで実行）:
+    python -m scripts.export_movie_snapshot snapshot/ --format parquet
+    python -m scripts.export_movie_snapshot snapshot/ --format arrow --year-from 2020 --year-to 2024
+
+2 回目以降は内容が変わった公開年のファイルのみ書き換える（--full で全て書き換える）。
+"""
+import argparse
+import logging
+
+from core.config import env_vars
+from core.dependencies import injector
+from usecase.movie.export_movie_snapshot import ExportMovieSnapshotUsecase
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the movie catalog as year-partitioned columnar files")
+    parser.add_argument("directory", help="output directory")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--year-from", type=int, default=1972)
+    parser.add_argument("--year-to", type=int, default=2100)
+    parser.add_argument("--page-size", type=int, default=env_vars.EXPORT_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=env_vars.MOVIE_RANGE_CONCURRENCY)
+    parser.add_argument("--full", action="store_true", help="rewrite every year even if unchanged")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    totals = injector.get(ExportMovieSnapshotUsecase).execute(
+        args.directory,
+        format=args.format,
+        year_from=args.year_from,
+        year_to=args.year_to,
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        incremental=not args.full,
+    )
+    print(totals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""映画テーブルを NDJSON（gzip 可）ファイルにエクスポートする
+
+使い方（src ディレクトリで実行）:
+    python -m scripts.export_movies backup.ndjson.gz --gzip --segments 8
+"""
+import argparse
+import logging
+
+from core.config import env_vars
+from core.dependencies import injector
+from usecase.movie.export_movies import ExportMoviesUsecase
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the movie table with a parallel Scan")
+    parser.add_argument("path", help="output file")
+    parser.add_argument("--gzip", action="store_true", help="gzip the output")
+    parser.add_argument("--segments", type=positive_int, default=env_vars.EXPORT_SCAN_SEGMENTS)
+    parser.add_argument("--page-size", type=int, default=env_vars.EXPORT_PAGE_SIZE)
+    parser.add_argument(
+        "--max-read-capacity",
+        type=float,
+        default=env_vars.EXPORT_MAX_READ_CAPACITY,
+        help="read capacity units per second (0 = unlimited)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = injector.get(ExportMoviesUsecase).execute(
+        args.path,
+        compress=args.gzip,
+        segments=args.segments,
+        page_size=args.page_size,
+        max_read_capacity=args.max_read_capacity,
+    )
+    print(f"Exported {count} items to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
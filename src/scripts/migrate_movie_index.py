@@ -0,0 +1,35 @@
+"""映画のインデックス用属性 (GSI1PK など) を現在のキー設計に合わせて書き換える
+
+MOVIE_LIST_SHARDS を変更した後と、評価順インデックス (GSI1SK の評価順・GSIndex2) の導入前に
+書き込まれた映画がある場合に実行する。実行するまで /top は 503 を返し、/list の並び順も正しくない
+（src ディレクトリで実行）:
+    python -m scripts.migrate_movie_index --dry-run
+    python -m scripts.migrate_movie_index
+"""
+import argparse
+import logging
+
+from core.config import env_vars
+from core.dependencies import injector
+from usecase.movie.migrate_movie_index import MigrateMovieIndexUsecase
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rewrite movie index attributes for the current key scheme")
+    parser.add_argument("--segments", type=int, default=env_vars.EXPORT_SCAN_SEGMENTS)
+    parser.add_argument("--page-size", type=int, default=env_vars.EXPORT_PAGE_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="only count the items that would be rewritten")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    totals = injector.get(MigrateMovieIndexUsecase).execute(
+        env_vars.MOVIE_LIST_SHARDS,
+        segments=args.segments,
+        page_size=args.page_size,
+        dry_run=args.dry_run,
+    )
+    print(totals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""公開年ごとの件数と評価の合計 (MOVIE_AGGREGATES_ENABLED) をテーブル全体から作り直す
+
+既存のテーブルで集計を有効にした後に実行する（src ディレクトリで実行）:
+    python -m scripts.rebuild_movie_aggregates
+"""
+import argparse
+import logging
+
+from core.config import env_vars
+from core.dependencies import injector
+from usecase.movie.rebuild_movie_aggregates import RebuildMovieAggregatesUsecase
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild per-year movie counts and rating sums")
+    parser.add_argument("--segments", type=int, default=env_vars.EXPORT_SCAN_SEGMENTS)
+    parser.add_argument("--page-size", type=int, default=env_vars.EXPORT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    aggregates = injector.get(RebuildMovieAggregatesUsecase).execute(
+        segments=args.segments,
+        page_size=args.page_size,
+    )
+    print(aggregates)
+
+
+if __name__ == "__main__":
+    main()
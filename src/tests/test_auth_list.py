@@ -0,0 +1,100 @@
+import json
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+from fastapi.testclient import TestClient
+
+from core import dependencies
+from core.aws_cognito import AWS_Cognito
+from core.config import env_vars
+from main import app
+
+
+class FakeCognitoClient:
+    """ListUsers を 1 件ずつのページで返す（fail_at のページでエラーにする）"""
+
+    def __init__(self, pages=3, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.threads = []
+
+    def list_users(self, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        page = int(kwargs.get("PaginationToken") or 0)
+        if page == self.fail_at:
+            raise ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "slow down"}}, "ListUsers")
+        response = {"Users": [{"Attributes": [{"Name": "email", "Value": f"user{page}@example.com"}]}]}
+        if page + 1 < self.pages:
+            response["PaginationToken"] = str(page + 1)
+        return response
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(env_vars, "AUTH_VERIFY_TOKENS", True)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    dependencies._aws_cognito = None
+
+
+def use_cognito(cognito_client):
+    dependencies._aws_cognito = AWS_Cognito(cognito_client)
+
+
+def login_as(role):
+    app.dependency_overrides[dependencies.verify_token] = lambda: {"sub": "user-1", "custom:role": role}
+
+
+@pytest.mark.parametrize("path", ["/api/v1/auth/list", "/api/v1/auth/list/stream"])
+def test_list_requires_token(client, path):
+    use_cognito(FakeCognitoClient())
+    assert client.get(path).status_code == 401
+
+
+@pytest.mark.parametrize("path", ["/api/v1/auth/list", "/api/v1/auth/list/stream"])
+def test_list_requires_admin_role(client, path):
+    use_cognito(FakeCognitoClient())
+    login_as("user")
+    assert client.get(path).status_code == 403
+
+
+def test_list_returns_page(client):
+    use_cognito(FakeCognitoClient())
+    login_as("admin")
+    response = client.get("/api/v1/auth/list", params={"limit": 1})
+    assert response.json() == {"items": [{"email": "user0@example.com"}], "next_cursor": "1"}
+
+
+def test_stream_walks_all_pages_on_cognito_executor(client):
+    cognito_client = FakeCognitoClient(pages=3)
+    use_cognito(cognito_client)
+    login_as("admin")
+    response = client.get("/api/v1/auth/list/stream")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"email": f"user{page}@example.com"} for page in range(3)]
+    assert all(name.startswith("cognito") for name in cognito_client.threads)
+
+
+def test_stream_marks_truncated_export(client):
+    use_cognito(FakeCognitoClient(pages=3, fail_at=1))
+    login_as("admin")
+    response = client.get("/api/v1/auth/list/stream")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0] == {"email": "user0@example.com"}
+    assert lines[-1] == {"error": "Too many requests", "status_code": 429}
+
+
+def test_stream_first_page_error_is_status_code(client):
+    use_cognito(FakeCognitoClient(fail_at=0))
+    login_as("admin")
+    assert client.get("/api/v1/auth/list/stream").status_code == 429
+
+
+def test_user_cache_stats_requires_admin(client):
+    use_cognito(FakeCognitoClient())
+    assert client.get("/api/v1/auth/user_cache_stats").status_code == 401
+    login_as("user")
+    assert client.get("/api/v1/auth/user_cache_stats").status_code == 403
+    login_as("admin")
+    assert "hit_rate" in client.get("/api/v1/auth/user_cache_stats").json()
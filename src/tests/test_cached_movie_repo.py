@@ -0,0 +1,90 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from domain.entity.movie import MovieForm
+from repository.cached_movie_repo import CachedMovieRepo
+from repository.in_memory_movie_repo import InMemoryMovieRepo
+
+
+class RacingMovieRepo(InMemoryMovieRepo):
+    """読み込みの途中で他のスレッドの書き込み（と破棄）が起きた状態を再現する"""
+
+    def __init__(self):
+        super().__init__(list_shards=1)
+        self.during_read = None
+
+    def get_movie(self, year, title):
+        item = super().get_movie(year, title)
+        self.__run_during_read()
+        return item
+
+    def query_movies(self, year, limit=None, cursor=None, fields=None):
+        page = super().query_movies(year, limit, cursor, fields)
+        self.__run_during_read()
+        return page
+
+    def list_movie(self, limit=None, cursor=None, fields=None):
+        page = super().list_movie(limit, cursor, fields)
+        self.__run_during_read()
+        return page
+
+    def __run_during_read(self):
+        during_read, self.during_read = self.during_read, None
+        if during_read is not None:
+            during_read()
+
+
+@pytest.fixture
+def inner():
+    repo = RacingMovieRepo()
+    repo.add_movie(MovieForm(year=2000, title="A", plot="old", rating=1))
+    return repo
+
+
+@pytest.fixture
+def cache(inner):
+    return CachedMovieRepo(inner, maxsize=100, ttl=60, negative_ttl=10)
+
+
+def update_during_read(inner, cache):
+    inner.during_read = lambda: cache.update_movie(MovieForm(year=2000, title="A", plot="new", rating=2))
+
+
+def test_get_movie_does_not_cache_value_read_before_invalidation(inner, cache):
+    update_during_read(inner, cache)
+    assert cache.get_movie(2000, "A")["info"]["plot"] == "old"
+    assert cache.get_movie(2000, "A")["info"]["plot"] == "new"
+
+
+def test_query_movies_does_not_cache_page_read_before_invalidation(inner, cache):
+    update_during_read(inner, cache)
+    cache.query_movies(2000)
+    items, _ = cache.query_movies(2000)
+    assert items[0]["info"]["plot"] == "new"
+
+
+def test_list_movie_does_not_cache_page_read_before_invalidation(inner, cache):
+    update_during_read(inner, cache)
+    cache.list_movie()
+    items, _ = cache.list_movie()
+    assert items[0]["info"]["plot"] == "new"
+
+
+def test_get_movie_is_cached_without_writes(inner, cache):
+    cache.get_movie(2000, "A")
+    inner.update_movie(MovieForm(year=2000, title="A", plot="new", rating=2))
+    assert cache.get_movie(2000, "A")["info"]["plot"] == "old"
+
+
+def test_errors_are_not_negatively_cached(inner, cache):
+    error = ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "GetItem")
+
+    def fail(year, title):
+        raise error
+
+    get_movie = inner.get_movie
+    inner.get_movie = fail
+    with pytest.raises(ClientError):
+        cache.get_movie(2000, "A")
+    inner.get_movie = get_movie
+    assert cache.get_movie(2000, "A")["info"]["plot"] == "old"
@@ -0,0 +1,217 @@
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from core.cognito_jwt import CognitoTokenVerifier, JWKSCache, JWKSUnavailableError
+
+ISSUER = "https://cognito-idp.ap-northeast-1.amazonaws.com/ap-northeast-1_test"
+CLIENT_ID = "test-client"
+
+
+def make_jwk(private_key, kid):
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, alg="RS256", use="sig")
+    return jwk
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def jwks(private_key):
+    """Cognito の代わりにローカルの JWKS を返す取得関数（呼び出し回数を数える）"""
+
+    class LocalJWKS:
+        def __init__(self):
+            self.keys = [make_jwk(private_key, "key-1")]
+            self.calls = 0
+            self.error = None
+
+        def __call__(self):
+            self.calls += 1
+            if self.error is not None:
+                raise self.error
+            return {"keys": list(self.keys)}
+
+    return LocalJWKS()
+
+
+@pytest.fixture
+def verifier(jwks):
+    return CognitoTokenVerifier(JWKSCache(jwks, refresh_interval=0, min_refetch_interval=30), ISSUER, CLIENT_ID)
+
+
+def make_token(private_key, kid="key-1", token_use="access", **claims):
+    payload = {
+        "sub": "user-1",
+        "iss": ISSUER,
+        "exp": int(time.time()) + 300,
+        "token_use": token_use,
+    }
+    if token_use == "access":
+        payload["client_id"] = CLIENT_ID
+    else:
+        payload["aud"] = CLIENT_ID
+    payload.update(claims)
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_verify_access_token(verifier, private_key):
+    claims = verifier.verify(make_token(private_key))
+    assert claims["sub"] == "user-1"
+    assert claims["token_use"] == "access"
+
+
+def test_verify_id_token(verifier, private_key):
+    claims = verifier.verify(make_token(private_key, token_use="id"))
+    assert claims["token_use"] == "id"
+
+
+def test_reject_access_token_for_other_client(verifier, private_key):
+    with pytest.raises(jwt.InvalidAudienceError):
+        verifier.verify(make_token(private_key, client_id="other-client"))
+
+
+def test_reject_id_token_for_other_audience(verifier, private_key):
+    with pytest.raises(jwt.InvalidAudienceError):
+        verifier.verify(make_token(private_key, token_use="id", aud="other-client"))
+
+
+def test_reject_unexpected_token_use(verifier, private_key):
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(private_key, token_use="refresh"))
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(private_key, token_use="id"), token_uses=("access",))
+
+
+def test_reject_expired_token(verifier, private_key):
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(make_token(private_key, exp=int(time.time()) - 60))
+
+
+def test_reject_other_issuer(verifier, private_key):
+    with pytest.raises(jwt.InvalidIssuerError):
+        verifier.verify(make_token(private_key, iss="https://example.com"))
+
+
+def test_reject_token_signed_by_other_key(verifier):
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(make_token(other_key))
+
+
+def test_reject_hs256_signed_with_public_key(verifier, jwks):
+    # 公開鍵を HMAC の鍵として使う alg の取り違えを受け付けない
+    token = jwt.api_jws.PyJWS().encode(
+        json.dumps({
+            "iss": ISSUER,
+            "exp": int(time.time()) + 300,
+            "token_use": "access",
+            "client_id": CLIENT_ID,
+        }).encode(),
+        b"not-the-rsa-key-but-long-enough-for-hmac",
+        algorithm="HS256",
+        headers={"kid": "key-1"},
+    )
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        verifier.verify(token)
+
+
+def test_reject_unsigned_token(verifier):
+    token = jwt.encode(
+        {"iss": ISSUER, "exp": int(time.time()) + 300, "token_use": "access", "client_id": CLIENT_ID},
+        None,
+        algorithm="none",
+        headers={"kid": "key-1"},
+    )
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "a.b.c", "eyJhbGciOiJSUzI1NiJ9.e30."])
+def test_reject_garbage(verifier, token):
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+
+
+def test_unknown_kid_refetches_once_then_rate_limited(verifier, jwks, private_key, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    verifier.verify(make_token(private_key))
+    assert jwks.calls == 1
+
+    # 鍵のローテーション直後: min_refetch_interval を過ぎていれば未知の kid で 1 回だけ取り直す
+    now[0] += 31
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwks.keys.append(make_jwk(new_key, "key-2"))
+    assert verifier.verify(make_token(new_key, kid="key-2"))["sub"] == "user-1"
+    assert jwks.calls == 2
+
+    # min_refetch_interval の間は未知の kid でも取り直さない
+    for _ in range(3):
+        with pytest.raises(jwt.InvalidTokenError):
+            verifier.verify(make_token(new_key, kid="key-3"))
+    assert jwks.calls == 2
+
+    now[0] += 31
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(new_key, kid="key-3"))
+    assert jwks.calls == 3
+
+
+def test_first_fetch_failure_is_unavailable_not_invalid(jwks, private_key):
+    verifier = CognitoTokenVerifier(JWKSCache(jwks, refresh_interval=0, min_refetch_interval=30), ISSUER, CLIENT_ID)
+    jwks.error = OSError("network is unreachable")
+    with pytest.raises(JWKSUnavailableError):
+        verifier.verify(make_token(private_key))
+    # 取り直しが制限されている間も、認証エラーにはしない
+    with pytest.raises(JWKSUnavailableError):
+        verifier.verify(make_token(private_key))
+    assert jwks.calls == 1
+
+
+def test_first_fetch_failure_recovers_after_interval(jwks, private_key):
+    verifier = CognitoTokenVerifier(JWKSCache(jwks, refresh_interval=0, min_refetch_interval=0), ISSUER, CLIENT_ID)
+    jwks.error = OSError("network is unreachable")
+    with pytest.raises(JWKSUnavailableError):
+        verifier.verify(make_token(private_key))
+    jwks.error = None
+    assert verifier.verify(make_token(private_key))["sub"] == "user-1"
+
+
+def test_refresh_failure_keeps_loaded_keys(jwks, private_key):
+    cache = JWKSCache(jwks, refresh_interval=0, min_refetch_interval=0)
+    verifier = CognitoTokenVerifier(cache, ISSUER, CLIENT_ID)
+    verifier.verify(make_token(private_key))
+    jwks.error = OSError("network is unreachable")
+    with pytest.raises(OSError):
+        cache.refresh()
+    assert verifier.verify(make_token(private_key))["sub"] == "user-1"
+    # 取得済みの鍵がある場合、未知の kid の取り直しに失敗しても不正なトークンとして扱う
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(make_token(private_key, kid="key-2"))
+
+
+def test_verify_token_dependency(verifier, jwks, private_key, monkeypatch):
+    from fastapi import HTTPException
+
+    from core.config import env_vars
+    from core.dependencies import verify_token
+
+    monkeypatch.setattr(env_vars, "AUTH_VERIFY_TOKENS", True)
+    assert verify_token(make_token(private_key), verifier)["sub"] == "user-1"
+    with pytest.raises(HTTPException) as error:
+        verify_token("garbage", verifier)
+    assert error.value.status_code == 401
+
+    unavailable = CognitoTokenVerifier(JWKSCache(jwks, refresh_interval=0), ISSUER, CLIENT_ID)
+    jwks.error = OSError("network is unreachable")
+    with pytest.raises(HTTPException) as error:
+        verify_token(make_token(private_key), unavailable)
+    assert error.value.status_code == 503
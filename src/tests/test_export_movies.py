@@ -0,0 +1,12 @@
+import pytest
+
+from repository.in_memory_movie_repo import InMemoryMovieRepo
+from usecase.movie.export_movies import ExportMoviesUsecase
+
+
+@pytest.mark.parametrize("segments", [0, -1])
+def test_reject_segments_below_one(tmp_path, segments):
+    path = tmp_path / "movies.ndjson"
+    with pytest.raises(ValueError):
+        ExportMoviesUsecase(InMemoryMovieRepo()).execute(str(path), segments=segments)
+    assert not path.exists()
@@ -0,0 +1,20 @@
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from repository.movie_decoder import decode_movie_item
+
+
+def test_decode_matches_type_deserializer():
+    item = {
+        "PK": {"S": "Movie|2013"},
+        "SK": {"S": "Movie|Rush"},
+        "info": {"M": {"plot": {"S": "A rivalry"}, "rating": {"N": "8.1"}}},
+        "GSI1SK": {"S": "8.1"},
+    }
+    deserializer = TypeDeserializer()
+    expected = {name: deserializer.deserialize(value) for name, value in item.items()}
+
+    decoded = decode_movie_item(item)
+    assert decoded == expected
+    assert isinstance(decoded["info"]["rating"], Decimal)
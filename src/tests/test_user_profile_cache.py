@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.user_profile_cache import UserProfileCache
+
+
+def user(role="old"):
+    return {"email": "user@example.com", "sub": "sub-1", "custom:role": role}
+
+
+def test_concurrent_lookups_load_once():
+    cache = UserProfileCache(maxsize=100, ttl=60)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return user()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(cache.get, "user@example.com", load)
+        started.wait(5)
+        followers = [executor.submit(cache.get, "User@Example.com", load) for _ in range(7)]
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert all(result == user() for result in results)
+    assert cache.get("user@example.com", load) == user()
+    assert len(calls) == 1
+
+
+def test_invalidate_during_load_is_not_cached():
+    cache = UserProfileCache(maxsize=100, ttl=60)
+
+    def load_then_change_password():
+        # 読み込みの応答が返る前に、別のリクエストでパスワード変更などが行われた場合
+        cache.invalidate(sub="sub-1")
+        return user("old")
+
+    assert cache.get("user@example.com", load_then_change_password)["custom:role"] == "old"
+    assert cache.get("user@example.com", lambda: user("new"))["custom:role"] == "new"
+
+
+def test_invalidate_by_sub_drops_email_key():
+    cache = UserProfileCache(maxsize=100, ttl=60)
+    cache.get("user@example.com", lambda: user("old"))
+    cache.invalidate(sub="sub-1")
+    assert cache.get("user@example.com", lambda: user("new"))["custom:role"] == "new"
+
+
+def test_load_errors_are_not_cached():
+    cache = UserProfileCache(maxsize=100, ttl=60)
+
+    def fail():
+        raise RuntimeError("cognito is down")
+
+    try:
+        cache.get("user@example.com", fail)
+    except RuntimeError:
+        pass
+    assert cache.get("user@example.com", lambda: user())["sub"] == "sub-1"
+    assert cache.stats()["hits"] == 0
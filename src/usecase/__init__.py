@@ -13,3 +13,16 @@ class Usecase:
         execute single usecase
         """
         raise NotImplementedError("must override usecase execute")  # pragma: no cover
+
+
+class AsyncUsecase:
+    """
+    Async usecase base class
+    """
+
+    @abstractmethod
+    async def execute(self, *args: Any):
+        """
+        execute single usecase without blocking the event loop
+        """
+        raise NotImplementedError("must override usecase execute")  # pragma: no cover
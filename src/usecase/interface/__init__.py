@@ -1 +1,5 @@
-from .i_movie_repo import IMovieRepo
\ No newline at end of file
+from .i_movie_repo import IMovieRepo
+from .i_async_movie_repo import IAsyncMovieRepo
+from .i_movie_index import IMovieIndex
+from .i_movie_search_index import IMovieSearchIndex
+from .i_movie_title_index import IMovieTitleIndex
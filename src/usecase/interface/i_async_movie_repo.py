@@ -0,0 +1,82 @@
+
+from abc import ABC, abstractmethod
+
+from domain.entity.movie import MovieForm
+
+class IAsyncMovieRepo(ABC):
+    """IMovieRepo の非同期版（イベントループをブロックしない DynamoDB アクセス）"""
+
+    @abstractmethod
+    async def add_movie(self, data: MovieForm):
+        """映画を登録する
+
+        Args:
+            data (MovieForm): 映画登録フォーム
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_movie(self, year, title):
+        """映画を 1 件取得する
+
+        Args:
+            year (_type_): 公開年
+            title (_type_): タイトル
+        """
+
+    @abstractmethod
+    async def update_movie(self, data: MovieForm):
+        """映画を更新する
+
+        Args:
+            data (MovieForm): 映画更新フォーム
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def query_movies(
+        self,
+        year,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list, str | None]:
+        """指定した年の映画を 1 ページ分取得する
+
+        Args:
+            year (_type_): 公開年
+            limit (int | None): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+            fields (tuple[str, ...] | None): 取得する項目（None の場合は全項目）
+
+        Returns:
+            tuple[list, str | None]: 取得したアイテムと次ページのカーソル
+        """
+
+    @abstractmethod
+    async def list_movie(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list, str | None]:
+        """映画一覧を 1 ページ分取得する
+
+        Args:
+            limit (int | None): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+            fields (tuple[str, ...] | None): 取得する項目（None の場合は全項目）
+
+        Returns:
+            tuple[list, str | None]: 取得したアイテムと次ページのカーソル
+        """
+
+    @abstractmethod
+    async def delete_movie(self, title, year):
+        """映画を削除する
+
+        Args:
+            title (_type_): タイトル
+            year (_type_): 公開年
+        """
+        raise NotImplementedError
@@ -0,0 +1,45 @@
+from abc import ABC, abstractmethod
+
+
+class IMovieIndex(ABC):
+    """映画の書き込みに合わせて更新されるプロセス内の読み込み用インデックス
+
+    起動時は start_build → load（ページごと）→ finish_build の順にテーブル全体から作り、
+    以降は書き込みのたびに put / remove で差分を反映する。
+    """
+
+    @abstractmethod
+    def start_build(self) -> None:
+        """テーブル全体からの作成を始める（以降の put / remove は load より優先される）"""
+
+    @abstractmethod
+    def load(self, items: list[dict]) -> None:
+        """Scan で読んだ映画のアイテムを追加する
+
+        Args:
+            items (list[dict]): PK・SK・info を持つアイテム
+        """
+
+    @abstractmethod
+    def finish_build(self) -> None:
+        """テーブル全体からの作成を終える"""
+
+    @abstractmethod
+    def put(self, year: int, title: str, plot: str, rating: float) -> None:
+        """映画を追加・更新する
+
+        Args:
+            year (int): 公開年
+            title (str): タイトル
+            plot (str): あらすじ
+            rating (float): 評価
+        """
+
+    @abstractmethod
+    def remove(self, year: int, title: str) -> None:
+        """映画を削除する
+
+        Args:
+            year (int): 公開年
+            title (str): タイトル
+        """
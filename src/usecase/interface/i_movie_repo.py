@@ -1,7 +1,7 @@
 
 from abc import ABC, abstractmethod
 
-from domain.entity.movie import MovieForm
+from domain.entity.movie import MovieForm, MovieOperation
 
 class IMovieRepo(ABC):
     @abstractmethod
@@ -34,6 +34,18 @@ class IMovieRepo(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def batch_add_movies(self, data: list[MovieForm]) -> list[str | None]:
+        """複数の映画をまとめて登録する
+
+        Args:
+            data (list[MovieForm]): 登録する映画
+
+        Returns:
+            list[str | None]: data と同じ順序の失敗理由（成功時は None）
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def get_movie(self, year, title):
         """_summary_
@@ -43,6 +55,17 @@ class IMovieRepo(ABC):
             title (_type_): _description_
         """
 
+    @abstractmethod
+    def batch_get_movies(self, keys: list[tuple]) -> list:
+        """複数の映画をまとめて取得する
+
+        Args:
+            keys (list[tuple]): (year, title) のリスト
+
+        Returns:
+            list: keys と同じ順序のアイテム（存在しない場合は None）
+        """
+
     @abstractmethod
     def update_movie(self, data: MovieForm):
         """_summary_
@@ -59,19 +82,155 @@ class IMovieRepo(ABC):
     def query_movies(
         self,
         year,
-    ):
-        """_summary_
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list, str | None]:
+        """指定した年の映画を 1 ページ分取得する
 
         Args:
-            year (_type_): _description_
+            year (_type_): 公開年
+            limit (int | None): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+            fields (tuple[str, ...] | None): 取得する項目（None の場合は全項目）
+
+        Returns:
+            tuple[list, str | None]: 取得したアイテムと次ページのカーソル
         """
 
     @abstractmethod
-    def list_movie(self):
-        """_summary_
+    def list_movie(
+        self,
+        limit: int | None = None,
+        cursor: str | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> tuple[list, str | None]:
+        """映画一覧を 1 ページ分取得する
+
+        Args:
+            limit (int | None): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+            fields (tuple[str, ...] | None): 取得する項目（None の場合は全項目）
+
+        Returns:
+            tuple[list, str | None]: 取得したアイテムと次ページのカーソル
+        """
+
+    @abstractmethod
+    def top_movies(
+        self,
+        limit: int,
+        year: int | None = None,
+        fields: tuple[str, ...] | None = None,
+    ) -> list:
+        """評価の高い順に映画を取得する
+
+        Args:
+            limit (int): 取得件数
+            year (int | None): 公開年（None の場合は全体）
+            fields (tuple[str, ...] | None): 取得する項目（None の場合は全項目）
+
+        Returns:
+            list: 評価の高い順のアイテム
+        """
+
+    @abstractmethod
+    def has_unmigrated_index_items(self) -> bool:
+        """評価順インデックスの導入前の形式 (GSI1SK="-"、GSI2PK なし) の映画が残っているかを返す
+
+        Returns:
+            bool: scripts.migrate_movie_index の実行が必要な場合は True
+        """
+
+    @abstractmethod
+    def complete_titles(self, year: int, prefix: str, limit: int) -> list[dict]:
+        """公開年の中でタイトルが prefix で始まる映画を SK の順に取得する
+
+        Args:
+            year (int): 公開年
+            prefix (str): タイトルの先頭部分（大文字・小文字を区別する）
+            limit (int): 最大件数
+
+        Returns:
+            list[dict]: PK・SK のみを持つアイテム
+        """
+
+    @abstractmethod
+    def count_movies(self, year: int | None = None) -> int:
+        """映画の件数を Select=COUNT で数える
+
+        Args:
+            year (int | None): 公開年（None の場合は全件）
+
+        Returns:
+            int: 件数
+        """
+
+    @abstractmethod
+    def aggregate_movies(self, year: int | None = None) -> list[dict]:
+        """書き込みのたびに更新される公開年ごとの集計を取得する
+
+        Args:
+            year (int | None): 公開年（None の場合は全ての公開年）
+
+        Returns:
+            list[dict]: year (公開年の文字列)・count・rating_sum を持つ集計
+        """
+
+    @abstractmethod
+    def put_movie_aggregates(self, aggregates: dict) -> list:
+        """公開年ごとの集計を上書きする
+
+        Args:
+            aggregates (dict): 公開年をキーとした (件数, 評価の合計)
+
+        Returns:
+            list: 公開年ごとのエラー（成功した場合は None）
+        """
+
+    @abstractmethod
+    def scan_movies(
+        self,
+        segment: int,
+        total_segments: int,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list, str | None, float]:
+        """テーブル全体を並列 Scan の 1 セグメント・1 ページ分取得する
+
+        Args:
+            segment (int): セグメント番号
+            total_segments (int): セグメント数
+            limit (int | None): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+
+        Returns:
+            tuple[list, str | None, float]: アイテム、次ページのカーソル、消費キャパシティ
+        """
+
+    @abstractmethod
+    def batch_delete_movies(self, keys: list[tuple]) -> list[str | None]:
+        """映画をまとめて削除する（BatchWriteItem を 25 件ずつ）
+
+        Args:
+            keys (list[tuple]): (year, title) のリスト
+
+        Returns:
+            list[str | None]: keys と同じ順序の失敗理由（成功時は None）
+        """
+
+    @abstractmethod
+    def transact_write_movies(self, operations: list[MovieOperation]) -> None:
+        """映画の追加・更新・削除を 1 回の TransactWriteItems でまとめて行う
+
+        全て成功するか、全て行われないかのどちらかとなる。
+
+        Args:
+            operations (list[MovieOperation]): 同じ映画を含まない操作のリスト
 
         Raises:
-            NotImplementedError: _description_
+            ValueError: 集計の更新を含めて 100 件を超える場合
+            ClientError: トランザクションが取り消された場合 (TransactionCanceledException)
         """
 
     @abstractmethod
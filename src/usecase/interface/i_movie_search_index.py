@@ -0,0 +1,19 @@
+from abc import abstractmethod
+
+from usecase.interface.i_movie_index import IMovieIndex
+
+
+class IMovieSearchIndex(IMovieIndex):
+
+    @abstractmethod
+    def search(self, query: str, limit: int, offset: int = 0) -> tuple[list[dict], int]:
+        """タイトルとあらすじをキーワードで検索する
+
+        Args:
+            query (str): 空白区切りのキーワード（全て含む映画を返す）
+            limit (int): 返す最大件数
+            offset (int): 先頭から読み飛ばす件数
+
+        Returns:
+            tuple[list[dict], int]: スコアの高い順の year・title・plot・rating・score と、ヒット件数
+        """
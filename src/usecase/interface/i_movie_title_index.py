@@ -0,0 +1,18 @@
+from abc import abstractmethod
+
+from usecase.interface.i_movie_index import IMovieIndex
+
+
+class IMovieTitleIndex(IMovieIndex):
+
+    @abstractmethod
+    def complete(self, prefix: str, limit: int) -> list[dict]:
+        """タイトルが prefix で始まる映画を返す（大文字・小文字と全角・半角は区別しない）
+
+        Args:
+            prefix (str): タイトルの先頭部分
+            limit (int): 返す最大件数
+
+        Returns:
+            list[dict]: タイトル順の year・title
+        """
@@ -0,0 +1,22 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import MovieForm, Movie, MovieInfo
+from usecase import AsyncUsecase
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class AsyncAddMovieUsecase(AsyncUsecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IAsyncMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    async def execute(self, body: MovieForm):
+        return await self.__movie_repo.add_movie(body)
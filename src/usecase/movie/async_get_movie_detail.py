@@ -0,0 +1,28 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import Movie
+from usecase import AsyncUsecase
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class AsyncGetMovieDetailUsecase(AsyncUsecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IAsyncMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    async def execute(self, year: int, title: str):
+        result = await self.__movie_repo.get_movie(year, title)
+        if result is None:
+            return None
+        
+        movie = Movie.to_dict(result)
+
+        return movie
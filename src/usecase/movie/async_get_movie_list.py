@@ -0,0 +1,39 @@
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import Movie, MoviePage, parse_movie_fields
+from usecase import AsyncUsecase
+from usecase.interface.i_async_movie_repo import IAsyncMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class AsyncGetMovieListUsecase(AsyncUsecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IAsyncMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    async def execute(self, limit: int | None = None, cursor: str | None = None, fields: str | None = None):
+        try:
+            selected_fields = parse_movie_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            list, next_cursor = await self.__movie_repo.list_movie(limit, cursor, selected_fields)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        movie_list = []
+        for result in list:
+            if selected_fields is None:
+                movie = Movie.to_dict(result)
+            else:
+                movie = Movie.to_fields(result, selected_fields)
+            movie_list.append(movie)
+
+        return MoviePage(items=movie_list, next_cursor=next_cursor)
@@ -0,0 +1,45 @@
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from core.config import env_vars
+from domain.entity.movie import Movie
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+from usecase.interface.i_movie_title_index import IMovieTitleIndex
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class AutocompleteMovieTitlesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo,
+        title_index: IMovieTitleIndex,
+    ):
+        self.__movie_repo = movie_repo
+        self.__title_index = title_index
+
+    def execute(self, prefix: str, limit: int = 10, year: int | None = None):
+        """タイトルが prefix で始まる映画をタイトル順に最大 limit 件返す
+
+        公開年を指定した場合はそのパーティションを begins_with で Query し（大文字・小文字を区別する）、
+        指定しない場合はプロセス内のタイトルインデックスから返す。
+
+        Args:
+            prefix (str): タイトルの先頭部分
+            limit (int): 最大件数
+            year (int | None): 公開年
+
+        Returns:
+            list[dict]: year・title
+        """
+        if year is not None:
+            items = self.__movie_repo.complete_titles(year, prefix, limit)
+            return [Movie.to_fields(item, ("year", "title")) for item in items]
+        if not env_vars.MOVIE_SEARCH_ENABLED:
+            raise HTTPException(status_code=404, detail="Movie title index is disabled")
+        return self.__title_index.complete(prefix, limit)
@@ -0,0 +1,67 @@
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+from usecase.interface.i_movie_search_index import IMovieSearchIndex
+from usecase.interface.i_movie_title_index import IMovieTitleIndex
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class BuildMovieIndexesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo,
+        search_index: IMovieSearchIndex,
+        title_index: IMovieTitleIndex,
+    ):
+        self.__movie_repo = movie_repo
+        self.__indexes = [search_index, title_index]
+
+    def execute(self, segments: int = 4, page_size: int | None = None) -> int:
+        """テーブルを並列 Scan してプロセス内のインデックスを作る
+
+        作成中に書き込まれた映画は Scan の内容より書き込みの内容を優先する。
+        Scan に失敗した場合は読めた分だけでインデックスを作り、起動は続ける。
+
+        Args:
+            segments (int): Scan のセグメント数（並列数）
+            page_size (int | None): 1 ページの最大件数
+
+        Returns:
+            int: 読み込んだ件数
+        """
+        def load_segment(segment: int) -> int:
+            count = 0
+            cursor = None
+            while True:
+                items, cursor, _ = self.__movie_repo.scan_movies(segment, segments, page_size, cursor)
+                for index in self.__indexes:
+                    index.load(items)
+                count += len(items)
+                if cursor is None:
+                    return count
+
+        for index in self.__indexes:
+            index.start_build()
+        count = 0
+        try:
+            with ThreadPoolExecutor(max_workers=segments) as executor:
+                count = sum(executor.map(load_segment, range(segments)))
+        except ClientError as err:
+            LOGGER.error(
+                "Couldn't build movie indexes. Here's why: %s: %s",
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+        finally:
+            for index in self.__indexes:
+                index.finish_build()
+        LOGGER.info("Loaded %s movies into indexes", count)
+        return count
@@ -0,0 +1,29 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class CountMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, year: int | None = None):
+        """映画の件数を返す（アイテム本体は転送しない）
+
+        Args:
+            year (int | None): 公開年（None の場合は全件）
+
+        Returns:
+            dict: 公開年と件数
+        """
+        return {"year": year, "count": self.__movie_repo.count_movies(year)}
@@ -0,0 +1,41 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import MovieBulkError, MovieBulkResult, MovieKey
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class DeleteMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, keys: list[MovieKey]):
+        """映画をまとめて削除する（存在しない映画の削除も成功として扱う）
+
+        Args:
+            keys (list[MovieKey]): 削除する映画の公開年とタイトル
+
+        Returns:
+            MovieBulkResult: 件数と削除に失敗した映画
+        """
+        results = self.__movie_repo.batch_delete_movies([(key.year, key.title) for key in keys]) if keys else []
+        errors = [
+            MovieBulkError(index=index, reason=reason, year=key.year, title=key.title)
+            for index, (key, reason) in enumerate(zip(keys, results))
+            if reason is not None
+        ]
+        return MovieBulkResult(
+            total=len(keys),
+            succeeded=len(keys) - len(errors),
+            failed=len(errors),
+            errors=errors,
+        )
@@ -19,7 +19,4 @@ class AddMovieUsecase(Usecase):
         self.__movie_repo = movie_repo
 
     def execute(self, body: MovieForm):
-        table_exists = self.__movie_repo.exists()
-        if not table_exists:
-            self.__movie_repo.create_table()
         return self.__movie_repo.update_movie(body)
\ No newline at end of file
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+# 出力形式ごとのファイルの拡張子
+SNAPSHOT_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+MANIFEST_FILE = "_manifest.json"
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as err:
+        raise RuntimeError("pyarrow is required for snapshot exports (poetry install -E export)") from err
+    return pyarrow
+
+
+@singleton
+class ExportMovieSnapshotUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(
+        self,
+        directory: str,
+        format: str = "parquet",
+        year_from: int = 1972,
+        year_to: int = 2100,
+        page_size: int | None = None,
+        concurrency: int = 8,
+        incremental: bool = True,
+    ) -> dict:
+        """映画を公開年ごとの Parquet / Arrow IPC ファイルに書き出す
+
+        {directory}/{year}.{parquet,arrow} に year・title・plot・rating の列で書き出す。
+        ディレクトリごと 1 つのデータセットとして読むこともできる（_ と . で始まるファイルは無視される）。
+        公開年ごとに Query の 1 ページを 1 レコードバッチとして書くため、メモリ上には
+        同時実行数分のページしか保持しない。書き込みは一時ファイルから置き換えるため、
+        読み込み側がメモリマップしているファイルが途中で壊れることはない。
+
+        incremental が True の場合は、前回の内容 (_manifest.json のハッシュ) と同じ公開年の
+        ファイルは書き換えない。映画がなくなった公開年のファイルは削除する。
+
+        Args:
+            directory (str): 出力先ディレクトリ
+            format (str): "parquet" または "arrow"
+            year_from (int): 書き出す最初の公開年
+            year_to (int): 書き出す最後の公開年
+            page_size (int | None): 1 ページ（1 レコードバッチ）の最大件数
+            concurrency (int): 同時に書き出す公開年の数
+            incremental (bool): 内容が変わった公開年のみ書き換えるかどうか
+
+        Returns:
+            dict: 書き換え・変更なし・削除した公開年の数と書き出した件数
+        """
+        if format not in SNAPSHOT_EXTENSIONS:
+            raise ValueError(f"Unknown snapshot format: {format}")
+        pa = _load_pyarrow()
+        schema = pa.schema([
+            ("year", pa.int16()),
+            ("title", pa.string()),
+            ("plot", pa.string()),
+            ("rating", pa.float64()),
+        ])
+
+        os.makedirs(directory, exist_ok=True)
+        manifest = self.__read_manifest(directory)
+        if manifest.get("format") != format:
+            manifest = {"format": format, "years": {}}
+
+        def export_year(year: int):
+            digest = hashlib.sha256()
+            rows = 0
+            path = os.path.join(directory, f"{year}.{SNAPSHOT_EXTENSIONS[format]}")
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{year}.", suffix=".tmp")
+            os.close(fd)
+            try:
+                writer = None
+                cursor = None
+                try:
+                    while True:
+                        items, cursor = self.__movie_repo.query_movies(year, page_size, cursor)
+                        if items:
+                            columns = {
+                                "year": [year] * len(items),
+                                "title": [item["SK"] for item in items],
+                                "plot": [item["info"]["plot"] for item in items],
+                                "rating": [float(item["info"]["rating"]) for item in items],
+                            }
+                            for title, plot, rating in zip(columns["title"], columns["plot"], columns["rating"]):
+                                digest.update(json.dumps([title, plot, rating], ensure_ascii=False).encode("utf-8"))
+                            batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+                            if writer is None:
+                                writer = self.__open_writer(pa, format, temp_path, schema)
+                            writer.write_batch(batch)
+                            rows += len(items)
+                        if cursor is None:
+                            break
+                finally:
+                    if writer is not None:
+                        writer.close()
+
+                previous = manifest["years"].get(str(year))
+                if rows == 0:
+                    if previous is None:
+                        return year, None, "empty"
+                    if os.path.exists(path):
+                        os.remove(path)
+                    return year, None, "removed"
+                entry = {"rows": rows, "sha256": digest.hexdigest()}
+                if incremental and previous is not None and previous.get("sha256") == entry["sha256"]:
+                    return year, previous, "unchanged"
+                os.replace(temp_path, path)
+                entry["exported_at"] = datetime.now(timezone.utc).isoformat()
+                return year, entry, "written"
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        totals = {"written": 0, "unchanged": 0, "removed": 0, "rows": 0}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for year, entry, result in executor.map(export_year, range(year_from, year_to + 1)):
+                if result == "empty":
+                    continue
+                totals[result] += 1
+                if entry is None:
+                    manifest["years"].pop(str(year), None)
+                else:
+                    manifest["years"][str(year)] = entry
+                if result == "written":
+                    totals["rows"] += entry["rows"]
+
+        self.__write_manifest(directory, manifest)
+        LOGGER.info("Exported movie snapshot to %s: %s", directory, totals)
+        return totals
+
+    def __open_writer(self, pa, format, path, schema):
+        if format == "parquet":
+            return pa.parquet.ParquetWriter(path, schema)
+        # Arrow IPC のファイル形式はそのままメモリマップして読める
+        return pa.ipc.new_file(path, schema)
+
+    def __read_manifest(self, directory: str) -> dict:
+        path = os.path.join(directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def __write_manifest(self, directory: str, manifest: dict) -> None:
+        path = os.path.join(directory, MANIFEST_FILE)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
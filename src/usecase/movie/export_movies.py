@@ -0,0 +1,116 @@
+import gzip
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from injector import inject, singleton
+from logging import getLogger
+
+from core.rate_limiter import RateLimiter
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+# ワーカーの終了を書き込み側に知らせる目印
+_DONE = object()
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@singleton
+class ExportMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(
+        self,
+        path: str,
+        compress: bool = False,
+        segments: int = 4,
+        page_size: int | None = None,
+        max_read_capacity: float = 0,
+    ) -> int:
+        """テーブル全体を並列 Scan で NDJSON ファイルに書き出す
+
+        各セグメントのワーカーはページ単位で上限付きキューに渡すため、
+        メモリ上に保持されるのは最大でもセグメント数の 2 倍のページ分となる。
+
+        Args:
+            path (str): 出力先ファイル
+            compress (bool): gzip 圧縮するかどうか
+            segments (int): Scan のセグメント数（並列数）
+            page_size (int | None): 1 ページの最大件数
+            max_read_capacity (float): 1 秒あたりの読み込みキャパシティ上限（0 は無制限）
+
+        Returns:
+            int: 書き出した件数
+
+        Raises:
+            ValueError: segments が 1 未満の場合
+        """
+        # 0 以下ではワーカーが起動せず、空のファイルを書き出して成功扱いになってしまう
+        if segments < 1:
+            raise ValueError(f"segments must be at least 1: {segments}")
+        pages = queue.Queue(maxsize=segments * 2)
+        limiter = RateLimiter(max_read_capacity)
+        stop = threading.Event()
+
+        def put(page) -> None:
+            # 書き込み側が異常終了した場合にワーカーが待ち続けないようにする
+            while not stop.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int) -> None:
+            cursor = None
+            try:
+                while not stop.is_set():
+                    limiter.acquire()
+                    items, cursor, consumed = self.__movie_repo.scan_movies(segment, segments, page_size, cursor)
+                    limiter.consume(consumed)
+                    if items:
+                        put(items)
+                    if cursor is None:
+                        break
+            finally:
+                put(_DONE)
+
+        count = 0
+        opener = gzip.open if compress else open
+        with ThreadPoolExecutor(max_workers=segments) as executor, opener(path, "wt", encoding="utf-8") as f:
+            futures = [executor.submit(scan_segment, segment) for segment in range(segments)]
+            remaining = segments
+            try:
+                while remaining:
+                    page = pages.get()
+                    if page is _DONE:
+                        remaining -= 1
+                        continue
+                    for item in page:
+                        f.write(json.dumps(item, ensure_ascii=False, default=_default))
+                        f.write("\n")
+                    count += len(page)
+            except BaseException:
+                stop.set()
+                raise
+            # ワーカーで発生した例外を呼び出し元に伝える
+            for future in futures:
+                future.result()
+
+        LOGGER.info("Exported %s items to %s", count, path)
+        return count
@@ -0,0 +1,41 @@
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from core.config import env_vars
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class GetMovieAggregatesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, year: int | None = None):
+        """書き込みのたびに更新される集計から件数と平均評価を返す
+
+        Args:
+            year (int | None): 公開年（None の場合は全ての公開年の合計）
+
+        Returns:
+            dict: 公開年・件数・評価の合計・平均評価
+        """
+        if not env_vars.MOVIE_AGGREGATES_ENABLED:
+            raise HTTPException(status_code=404, detail="Movie aggregates are disabled")
+        items = self.__movie_repo.aggregate_movies(year)
+        count = sum(int(item.get("count", 0)) for item in items)
+        rating_sum = sum(float(item.get("rating_sum", 0)) for item in items)
+        return {
+            "year": year,
+            "count": count,
+            "rating_sum": rating_sum,
+            "rating_average": rating_sum / count if count > 0 else None,
+        }
@@ -0,0 +1,25 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class GetMovieCacheStatsUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self):
+        # キャッシュが無効な場合はリポジトリに stats がない
+        stats = getattr(self.__movie_repo, "stats", None)
+        if stats is None:
+            return {"enabled": False}
+        return {"enabled": True, **stats()}
@@ -19,9 +19,6 @@ class GetMovieDetailUsecase(Usecase):
         self.__movie_repo = movie_repo
 
     def execute(self, year: int, title: str):
-        table_exists = self.__movie_repo.exists()
-        if not table_exists:
-            self.__movie_repo.create_table()
         result = self.__movie_repo.get_movie(year, title)
         if result is None:
             return None
@@ -0,0 +1,23 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import Movie, MovieKey
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class GetMovieDetailsUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, keys: list[MovieKey]):
+        results = self.__movie_repo.batch_get_movies([(key.year, key.title) for key in keys])
+        return [None if result is None else Movie.to_dict(result) for result in results]
@@ -1,7 +1,8 @@
+from fastapi import HTTPException
 from injector import inject, singleton
 from logging import getLogger
 
-from domain.entity.movie import Movie
+from domain.entity.movie import Movie, MoviePage, parse_movie_fields
 from usecase import Usecase
 from usecase.interface.i_movie_repo import IMovieRepo
 
@@ -18,14 +19,21 @@ class GetMovieListUsecase(Usecase):
     ):
         self.__movie_repo = movie_repo
 
-    def execute(self):
-        table_exists = self.__movie_repo.exists()
-        if not table_exists:
-            self.__movie_repo.create_table()
-        list = self.__movie_repo.list_movie()
+    def execute(self, limit: int | None = None, cursor: str | None = None, fields: str | None = None):
+        try:
+            selected_fields = parse_movie_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            list, next_cursor = self.__movie_repo.list_movie(limit, cursor, selected_fields)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
         movie_list = []
         for result in list:
-            movie = Movie.to_dict(result)
+            if selected_fields is None:
+                movie = Movie.to_dict(result)
+            else:
+                movie = Movie.to_fields(result, selected_fields)
             movie_list.append(movie)
 
-        return movie_list
\ No newline at end of file
+        return MoviePage(items=movie_list, next_cursor=next_cursor)
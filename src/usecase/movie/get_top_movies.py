@@ -0,0 +1,59 @@
+import time
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import Movie, parse_movie_fields
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+# 移行が必要な状態の再確認の間隔（秒）。移行済みと確認した後は再確認しない
+MIGRATION_CHECK_INTERVAL = 60
+
+@singleton
+class GetTopMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+        self.__migrated = False
+        self.__checked_at = None
+
+    def execute(self, limit: int, year: int | None = None, fields: str | None = None):
+        try:
+            selected_fields = parse_movie_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not self.__is_migrated():
+            # 古い形式の映画は評価順インデックスに含まれないため、誤った上位を返さない
+            raise HTTPException(
+                status_code=503,
+                detail="Movie index migration is required: run python -m scripts.migrate_movie_index",
+            )
+        list = self.__movie_repo.top_movies(limit, year, selected_fields)
+        movie_list = []
+        for result in list:
+            if selected_fields is None:
+                movie = Movie.to_dict(result)
+            else:
+                movie = Movie.to_fields(result, selected_fields)
+            movie_list.append(movie)
+
+        return movie_list
+
+    def __is_migrated(self) -> bool:
+        if self.__migrated:
+            return True
+        now = time.monotonic()
+        if self.__checked_at is None or now - self.__checked_at >= MIGRATION_CHECK_INTERVAL:
+            self.__checked_at = now
+            self.__migrated = not self.__movie_repo.has_unmigrated_index_items()
+            if not self.__migrated:
+                LOGGER.warning("Movies written before the rating index remain; run scripts.migrate_movie_index")
+        return self.__migrated
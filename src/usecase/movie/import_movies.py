@@ -0,0 +1,81 @@
+import json
+
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+from pydantic import ValidationError
+
+from domain.entity.movie import MovieForm, MovieBulkError, MovieBulkResult
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class ImportMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, body: bytes, content_type: str = ""):
+        records = self.__parse(body, content_type)
+
+        forms: list[MovieForm] = []
+        form_indexes: list[int] = []
+        errors: list[MovieBulkError] = []
+        for index, record in enumerate(records):
+            if isinstance(record, MovieBulkError):
+                errors.append(record)
+                continue
+            try:
+                forms.append(MovieForm.model_validate(record))
+                form_indexes.append(index)
+            except ValidationError as e:
+                reason = "; ".join(
+                    f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+                errors.append(MovieBulkError(index=index, reason=reason))
+
+        results = self.__movie_repo.batch_add_movies(forms) if forms else []
+        for index, form, reason in zip(form_indexes, forms, results):
+            if reason is not None:
+                errors.append(MovieBulkError(index=index, reason=reason, year=form.year, title=form.title))
+
+        errors.sort(key=lambda error: error.index)
+        return MovieBulkResult(
+            total=len(records),
+            succeeded=len(records) - len(errors),
+            failed=len(errors),
+            errors=errors,
+        )
+
+    def __parse(self, body: bytes, content_type: str) -> list:
+        """JSON 配列または NDJSON を要素ごとに分解する"""
+        try:
+            text = body.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Request body must be UTF-8")
+        if "ndjson" not in content_type and text.startswith("["):
+            try:
+                records = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+            if not isinstance(records, list):
+                raise HTTPException(status_code=400, detail="Request body must be a JSON array")
+            return records
+
+        records = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                records.append(MovieBulkError(index=len(records), reason=f"Invalid JSON: {e}"))
+        return records
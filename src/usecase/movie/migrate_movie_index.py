@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+from injector import inject, singleton
+from logging import getLogger
+from pydantic import ValidationError
+
+from domain.entity.movie import Movie, MovieForm
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+# インデックス用の属性（to_db の結果と比較して書き換え要否を判定する）
+INDEX_ATTRIBUTES = ("GSI1PK", "GSI1SK", "GSI2PK", "GSI2SK")
+
+@singleton
+class MigrateMovieIndexUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, shards: int, segments: int = 4, page_size: int | None = None, dry_run: bool = False) -> dict:
+        """インデックス用の属性が現在のキー設計と異なる映画を書き換える
+
+        テーブルを並列 Scan し、ページごとに BatchWriteItem で書き戻す。
+        書き戻しは項目全体の上書きのため、移行中の更新は避けること。
+
+        Args:
+            shards (int): GSIndex1 のパーティション分割数（リポジトリの設定と同じ値）
+            segments (int): Scan のセグメント数（並列数）
+            page_size (int | None): 1 ページの最大件数
+            dry_run (bool): True の場合は件数の集計のみ行う
+
+        Returns:
+            dict: 走査件数・書き換え件数・失敗件数
+        """
+        def migrate_segment(segment: int) -> dict:
+            counts = {"scanned": 0, "rewritten": 0, "failed": 0}
+            cursor = None
+            while True:
+                items, cursor, _ = self.__movie_repo.scan_movies(segment, segments, page_size, cursor)
+                forms = []
+                for item in items:
+                    if not item.get("PK", "").startswith("Movie|"):
+                        continue
+                    counts["scanned"] += 1
+                    try:
+                        form = self.__to_form(item)
+                    except (KeyError, ValueError, ValidationError) as e:
+                        LOGGER.error("Couldn't migrate %s %s: %s", item.get("PK"), item.get("SK"), e)
+                        counts["failed"] += 1
+                        continue
+                    expected = Movie.to_db(form, shards)
+                    if any(item.get(name) != expected.get(name) for name in INDEX_ATTRIBUTES):
+                        forms.append(form)
+                if forms and not dry_run:
+                    errors = self.__movie_repo.batch_add_movies(forms)
+                    counts["failed"] += sum(error is not None for error in errors)
+                    counts["rewritten"] += sum(error is None for error in errors)
+                elif forms:
+                    counts["rewritten"] += len(forms)
+                if cursor is None:
+                    return counts
+
+        totals = {"scanned": 0, "rewritten": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            for counts in executor.map(migrate_segment, range(segments)):
+                for key, value in counts.items():
+                    totals[key] += value
+        LOGGER.info("Movie index migration finished: %s", totals)
+        return totals
+
+    def __to_form(self, item: dict) -> MovieForm:
+        movie = Movie.to_dict(item)
+        return MovieForm(
+            year=movie.year,
+            title=movie.title,
+            plot=movie.info.plot,
+            rating=float(movie.info.rating),
+        )
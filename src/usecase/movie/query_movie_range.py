@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+from typing import Iterator
+
+from domain.entity.movie import Movie, parse_movie_fields
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class QueryMovieRangeUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(
+        self,
+        year_from: int,
+        year_to: int,
+        fields: str | None = None,
+        concurrency: int = 8,
+    ) -> Iterator[Movie | dict]:
+        # ストリーム開始後はステータスを変更できないため、パラメータは先に検証する
+        if year_from > year_to:
+            raise HTTPException(status_code=400, detail="year_from must be less than or equal to year_to")
+        try:
+            selected_fields = parse_movie_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return self.__iter_movies(range(year_from, year_to + 1), selected_fields, concurrency)
+
+    def __iter_movies(self, years: range, fields: tuple[str, ...] | None, concurrency: int) -> Iterator[Movie | dict]:
+        # 年ごとの Query を並列に実行し、年の昇順に揃えて完了したものから返す
+        executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(years))))
+        try:
+            futures = [executor.submit(self.__query_year, year, fields) for year in years]
+            for future in futures:
+                for result in future.result():
+                    if fields is None:
+                        yield Movie.to_dict(result)
+                    else:
+                        yield Movie.to_fields(result, fields)
+        finally:
+            # クライアントが切断した場合などは残りの Query を取り消す
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __query_year(self, year: int, fields: tuple[str, ...] | None) -> list:
+        items = []
+        cursor = None
+        while True:
+            page, cursor = self.__movie_repo.query_movies(year, None, cursor, fields)
+            items.extend(page)
+            if cursor is None:
+                return items
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class RebuildMovieAggregatesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, segments: int = 4, page_size: int | None = None) -> dict:
+        """テーブルを並列 Scan して公開年ごとの集計を作り直す
+
+        集計の更新を有効にする前に書き込まれた映画や、集計の更新に失敗した分を反映する。
+        作り直している間の書き込みは集計に含まれない場合があるため、書き込みの少ない時間に実行すること。
+
+        Args:
+            segments (int): Scan のセグメント数（並列数）
+            page_size (int | None): 1 ページの最大件数
+
+        Returns:
+            dict: 公開年をキーとした件数と評価の合計
+        """
+        def aggregate_segment(segment: int) -> dict:
+            aggregates = {}
+            cursor = None
+            while True:
+                items, cursor, _ = self.__movie_repo.scan_movies(segment, segments, page_size, cursor)
+                for item in items:
+                    year = item["PK"].split("|", 1)[1]
+                    count, rating_sum = aggregates.get(year, (0, Decimal(0)))
+                    rating = Decimal(str(item.get("info", {}).get("rating", 0)))
+                    aggregates[year] = (count + 1, rating_sum + rating)
+                if cursor is None:
+                    return aggregates
+
+        totals = {}
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            for aggregates in executor.map(aggregate_segment, range(segments)):
+                for year, (count, rating_sum) in aggregates.items():
+                    total_count, total_rating_sum = totals.get(year, (0, Decimal(0)))
+                    totals[year] = (total_count + count, total_rating_sum + rating_sum)
+
+        # 映画がなくなった公開年の集計は 0 にする
+        for item in self.__movie_repo.aggregate_movies():
+            totals.setdefault(item["year"], (0, Decimal(0)))
+
+        errors = self.__movie_repo.put_movie_aggregates(totals)
+        for year, error in zip(totals, errors):
+            if error is not None:
+                LOGGER.error("Couldn't write movie aggregate for %s: %s", year, error)
+        LOGGER.info("Rebuilt movie aggregates for %s years", len(totals))
+        return {year: {"count": count, "rating_sum": float(rating_sum)} for year, (count, rating_sum) in totals.items()}
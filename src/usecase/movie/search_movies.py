@@ -0,0 +1,56 @@
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from core.config import env_vars
+from core.dynamodb import decode_cursor, encode_cursor
+from domain.entity.movie import MovieInfo, MovieSearchHit, MovieSearchPage
+from usecase import Usecase
+from usecase.interface.i_movie_search_index import IMovieSearchIndex
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class SearchMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        search_index: IMovieSearchIndex
+    ):
+        self.__search_index = search_index
+
+    def execute(self, query: str, limit: int = 20, cursor: str | None = None):
+        """タイトルとあらすじをキーワードで検索し、スコアの高い順に 1 ページ分返す
+
+        Args:
+            query (str): 空白区切りのキーワード
+            limit (int): 1 ページの最大件数
+            cursor (str | None): 前ページの next_cursor
+
+        Returns:
+            MovieSearchPage: スコア付きの検索結果・ヒット件数・次ページのカーソル
+        """
+        if not env_vars.MOVIE_SEARCH_ENABLED:
+            raise HTTPException(status_code=404, detail="Movie search is disabled")
+        try:
+            position = decode_cursor(cursor)
+            offset = 0 if position is None else int(position["offset"])
+            if offset < 0:
+                raise ValueError("Invalid cursor")
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        results, total = self.__search_index.search(query, limit, offset)
+        items = [
+            MovieSearchHit(
+                year=result["year"],
+                title=result["title"],
+                info=MovieInfo(plot=result["plot"], rating=result["rating"]),
+                score=result["score"],
+            )
+            for result in results
+        ]
+        next_offset = offset + len(results)
+        next_cursor = encode_cursor({"offset": str(next_offset)}) if next_offset < total else None
+        return MovieSearchPage(items=items, total=total, next_cursor=next_cursor)
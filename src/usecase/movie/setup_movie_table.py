@@ -0,0 +1,24 @@
+from injector import inject, singleton
+from logging import getLogger
+
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class SetupMovieTableUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self):
+        table_exists = self.__movie_repo.exists()
+        if not table_exists:
+            LOGGER.info("Movie table not found, creating it")
+            self.__movie_repo.create_table()
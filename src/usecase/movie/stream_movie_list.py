@@ -0,0 +1,42 @@
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+from typing import Iterator
+
+from domain.entity.movie import Movie, parse_movie_fields
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class StreamMovieListUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, page_size: int | None = None, fields: str | None = None) -> Iterator[Movie | dict]:
+        # ストリーム開始後はステータスを変更できないため、パラメータは先に検証する
+        try:
+            selected_fields = parse_movie_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return self.__iter_movies(page_size, selected_fields)
+
+    def __iter_movies(self, page_size: int | None, fields: tuple[str, ...] | None) -> Iterator[Movie | dict]:
+        # 1 ページずつ取得して逐次返すため、メモリ上には常に 1 ページ分のみ保持する
+        cursor = None
+        while True:
+            list, cursor = self.__movie_repo.list_movie(page_size, cursor, fields)
+            for result in list:
+                if fields is None:
+                    yield Movie.to_dict(result)
+                else:
+                    yield Movie.to_fields(result, fields)
+            if cursor is None:
+                break
@@ -0,0 +1,48 @@
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from injector import inject, singleton
+from logging import getLogger
+
+from domain.entity.movie import MovieOperation
+from usecase import Usecase
+from usecase.interface.i_movie_repo import IMovieRepo
+
+
+LOGGER = getLogger(__name__)
+
+@singleton
+class TransactMoviesUsecase(Usecase):
+
+    @inject
+    def __init__(
+        self,
+        movie_repo: IMovieRepo
+    ):
+        self.__movie_repo = movie_repo
+
+    def execute(self, operations: list[MovieOperation]):
+        """映画の追加・更新・削除を 1 回のトランザクションで行う
+
+        Args:
+            operations (list[MovieOperation]): 操作のリスト（同じ映画は 1 回まで）
+
+        Returns:
+            dict: 書き込んだ操作の件数
+        """
+        keys = [(operation.year, operation.title) for operation in operations]
+        if len(set(keys)) != len(keys):
+            raise HTTPException(status_code=400, detail="Each movie can appear only once in a transaction")
+        try:
+            self.__movie_repo.transact_write_movies(operations)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ClientError as err:
+            if err.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            # 取り消された理由を操作の順に返す（条件を満たさない更新や同時更新の競合など）
+            reasons = [reason.get("Code") for reason in err.response.get("CancellationReasons", [])]
+            raise HTTPException(
+                status_code=409,
+                detail=f"Transaction cancelled: {', '.join(str(reason) for reason in reasons[:len(operations)])}",
+            )
+        return {"succeeded": len(operations)}
@@ -2,12 +2,62 @@ import botocore.exceptions
 from fastapi import HTTPException
 from fastapi.responses import JSONResponse
 import botocore
+import jwt
 import logging
 from pydantic import EmailStr
+from typing import AsyncIterator
 
-from core.aws_cognito import AWS_Cognito
+from core.aws_cognito import AWS_Cognito, run_cognito
+from core.config import env_vars
 from domain.entity.user import UserSignUp, UserVerify, UserSignIn, ConfirmForgotPassword, ChangePassword
 
+# ListUsers の 1 ページあたりの上限件数
+LIST_USERS_LIMIT = 60
+
+
+def _user_filter(email_prefix: str | None, user_status: str | None) -> str | None:
+    """ListUsers の Filter を作る（Cognito の Filter に指定できる属性は 1 つのみ）"""
+    if email_prefix is not None and user_status is not None:
+        raise HTTPException(status_code=400, detail="Only one of email_prefix and status can be specified")
+    if email_prefix is not None:
+        escaped = email_prefix.replace("\\", "\\\\").replace('"', '\\"')
+        return f'email ^= "{escaped}"'
+    if user_status is not None:
+        return f'cognito:user_status = "{user_status}"'
+    return None
+
+
+def _user_attributes(attributes: str | None) -> list[str] | None:
+    """カンマ区切りの属性名を AttributesToGet のリストにする"""
+    if attributes is None:
+        return None
+    names = [name.strip() for name in attributes.split(",") if name.strip()]
+    return names or None
+
+
+def _list_users_page(cognito: AWS_Cognito, limit, cursor, filter, attributes) -> tuple[list[dict], str | None]:
+    """ListUsers を 1 回呼び出し、属性の dict のリストと次のページのトークンを返す"""
+    try:
+        response = cognito.list_user(limit, cursor, filter, attributes)
+    except botocore.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] == "UserNotFoundException":
+            raise HTTPException(
+                status_code=404, detail="User does not exist"
+            )
+        elif e.response["Error"]["Code"] == "InvalidParameterException":
+            raise HTTPException(status_code=400, detail=e.response["Error"]["Message"])
+        elif e.response["Error"]["Code"] == "TooManyRequestsException":
+            raise HTTPException(
+                status_code=429, detail="Too many requests"
+            )
+        else:
+            raise HTTPException(status_code=500, detail="Internal Server")
+    users = [
+        {attribute["Name"]: attribute["Value"] for attribute in user["Attributes"]}
+        for user in response["Users"]
+    ]
+    return users, response.get("PaginationToken")
+
 
 class AuthService:
     def user_signup(user: UserSignUp, cognito: AWS_Cognito):
@@ -124,12 +174,16 @@ class AuthService:
             else:
                 raise HTTPException(status_code=500, detail="Internal Server")
         else:
-            userRes = cognito.check_user_exists(data.email)
-            user = userRes["UserAttributes"]
-            for att in user:
-                if att["Name"] == "custom:role":
-                    role = att["Value"]
-            
+            # ロールは Cognito から直接受け取った ID トークンのクレームから読む（署名の検証は不要）
+            claims = jwt.decode(
+                response["AuthenticationResult"]["IdToken"],
+                options={"verify_signature": False},
+            )
+            role = claims.get("custom:role")
+            if role is None:
+                # アプリクライアントに custom:role の読み取り権限がない場合は AdminGetUser（キャッシュ）で読む
+                role = cognito.get_user_attributes(data.email).get("custom:role")
+
             content = {
                 "message": "User signed in successfully",
                 "AccessToken": response["AuthenticationResult"]["AccessToken"],
@@ -278,7 +332,7 @@ class AuthService:
             cognito (AWS_Cognito): AWSCognito
         """
         try:
-            response = cognito.check_user_exists(email)
+            user = cognito.get_user_attributes(email)
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "UserNotFoundException":
                 raise HTTPException(
@@ -287,31 +341,78 @@ class AuthService:
             else:
                 raise HTTPException(status_code=500, detail="Internal Server")
         else:
-            user = {}
-            for attribute in response["UserAttributes"]:
-                user[attribute["Name"]] = attribute["Value"]
             return JSONResponse(content=user, status_code=200)
+
+    def user_cache_stats(cognito: AWS_Cognito):
+        """ユーザ属性のキャッシュのヒット率などを取得
+
+        Args:
+            cognito (AWS_Cognito): AWSCognito
+        """
+        content = {"enabled": env_vars.USER_CACHE_ENABLED, **cognito.profiles.stats()}
+        return JSONResponse(content=content, status_code=200)
         
-    def list_user(cognito: AWS_Cognito):
-        """ユーザ一覧取得
+    def list_user(
+        cognito: AWS_Cognito,
+        limit: int | None = None,
+        cursor: str | None = None,
+        email_prefix: str | None = None,
+        user_status: str | None = None,
+        attributes: str | None = None,
+    ):
+        """ユーザ一覧取得（1 ページ分）
 
         Args:
             cognito (AWS_Cognito): AWSCognito
+            limit (int | None): 最大件数（60 件まで）
+            cursor (str | None): 前のページの next_cursor
+            email_prefix (str | None): メールアドレスの前方一致の条件
+            user_status (str | None): ユーザのステータス (CONFIRMED など) の条件
+            attributes (str | None): 返す属性名のカンマ区切り
         """
-        try:
-            response = cognito.list_user()
-        except botocore.exceptions.ClientError as e:
-            if e.response["Error"]["Code"] == "UserNotFoundException":
-                raise HTTPException(
-                    status_code=404, detail="User does not exist"
-                )
-            else:
-                raise HTTPException(status_code=500, detail="Internal Server")
-        else:
-            users = []
-            for user in response["Users"]:
-                member = {}
-                for attribute in user["Attributes"]:
-                    member[attribute["Name"]] = attribute["Value"]
-                users.append(member)
-            return JSONResponse(content=users, status_code=200)
+        users, next_cursor = _list_users_page(
+            cognito,
+            limit,
+            cursor,
+            _user_filter(email_prefix, user_status),
+            _user_attributes(attributes),
+        )
+        return JSONResponse(content={"items": users, "next_cursor": next_cursor}, status_code=200)
+
+    async def stream_users(
+        cognito: AWS_Cognito,
+        email_prefix: str | None = None,
+        user_status: str | None = None,
+        attributes: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """ユーザ一覧を全ページ分、1 ページずつ取得しながら返す
+
+        各ページは Cognito 専用のスレッドプールで取得する。ストリーム開始後はステータスを
+        変更できないため、最初のページは呼び出し時に取得し、途中のページの取得に失敗した場合は
+        最後に {"error": ...} を返して、途中で切れた一覧を完全なものと区別できるようにする。
+
+        Args:
+            cognito (AWS_Cognito): AWSCognito
+            email_prefix (str | None): メールアドレスの前方一致の条件
+            user_status (str | None): ユーザのステータス (CONFIRMED など) の条件
+            attributes (str | None): 返す属性名のカンマ区切り
+        """
+        filter = _user_filter(email_prefix, user_status)
+        names = _user_attributes(attributes)
+        users, cursor = await run_cognito(_list_users_page, cognito, LIST_USERS_LIMIT, None, filter, names)
+
+        async def iter_users():
+            nonlocal users, cursor
+            while True:
+                for user in users:
+                    yield user
+                if cursor is None:
+                    break
+                try:
+                    users, cursor = await run_cognito(_list_users_page, cognito, LIST_USERS_LIMIT, cursor, filter, names)
+                except HTTPException as e:
+                    logging.error("Couldn't list users. Here's why: %s", e.detail)
+                    yield {"error": e.detail, "status_code": e.status_code}
+                    return
+
+        return iter_users()